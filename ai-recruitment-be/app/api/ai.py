@@ -299,225 +299,327 @@
 #     for r in sorted_results
 #     ]
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+import json
+import time
 
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, get_db
 from app.api.deps import get_current_user
+from app.models.job_posting import JobPosting
+from app.models.screening_run import ScreeningRun
 from app.models.user import User
-from app.models.application import Application
-from app.schemas.request import AIMatchRequest
-from app.models.ai_screening_result import AIScreeningResult
-
-from app.services.matching import build_job_profile_dict
-from app.services.matching import build_job_description_text
-from app.services.matching import build_candidate_text
-from app.services.matching import match_candidates
-from app.services.query import score_candidates_with_llm
-import math
+from app.schemas.request import AIMatchRequest, AITalentSearchRequest
+
+from app.services.job_embedding import get_job_embedding
+from app.services.llm_cache import llm_store
+from app.services.llm_client import llm_client
+from app.services.query import iter_llm_scores, score_candidates_with_llm
+from app.services.screening import (
+    build_shortlist,
+    llm_candidates,
+    match_metrics,
+    save_screening_results,
+    split_reusable,
+    to_ui_result,
+)
+from app.services.screening_runs import screening_runner
+from app.services.talent_pool import candidate_pool, load_candidate_pool
 
 router = APIRouter(prefix="/ai", tags=["AI Matching"])
 
 
-def map_llm_recommendation(rec: str) -> str:
-    rec = rec.lower().strip()
-    if rec == "lolos":
-        return "PASS"
-    elif rec in ["pertimbangkan", "review"]:
-        return "REVIEW"
-    return "REJECT"
-
-
 @router.post("/match")
 def ai_match(
     payload: AIMatchRequest,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     if current_user.role != "hrd":
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    # =========================
-    # 1️⃣ JOB PROFILE (FULL)
-    # =========================
-    job_profile = build_job_profile_dict(db,payload.job_id)
-    job_text = build_job_description_text(job_profile)
-    print("Job Text:", job_text)
+    start = time.perf_counter()
 
     # =========================
-    # 2️⃣ APPLICATIONS
+    # 1️⃣-4️⃣ JOB, PREFILTER, APPLICATIONS, HYBRID MATCHING
     # =========================
-    applications = (
-        db.query(Application)
-        .options(
-            joinedload(Application.user).joinedload(User.skills),
-            joinedload(Application.user).joinedload(User.experiences),
-            joinedload(Application.user).joinedload(User.educations),
-            joinedload(Application.user).joinedload(User.salary),
-            joinedload(Application.user).joinedload(User.documents),
-        )
-        .filter(Application.job_id == payload.job_id)
-        .all()
+    context = build_shortlist(
+        db,
+        payload.job_id,
+        max_salary=payload.max_salary,
+        location=payload.location,
+    )
+
+    prefilter = context["prefilter"]
+    response.headers["X-Prefilter-Kept"] = str(prefilter["kept"])
+    response.headers["X-Prefilter-Removed"] = ",".join(
+        f"{rule}={count}" for rule, count in prefilter["removed"].items()
     )
 
-    if not applications:
+    if not context["shortlist"]:
         return []
 
     # =========================
-    # 3️⃣ BUILD CANDIDATE TEXT
+    # 5️⃣ LLM HR REASONING (hanya pasangan job/profil yang berubah)
     # =========================
-    candidates_for_matching = []
-
-    for app in applications:
-        user = app.user
-
-        candidate_dict = {
-            "id": user.id,
-            "positionApplied": job_profile["title"],
-            "user": {
-                "name": user.full_name,
-                "email": user.email,
-                "location": user.location,
-            },
-            "skills": [{"name": s.name, "level": s.level} for s in user.skills],
-            "workExperience": [
-                {
-                    "jobTitle": e.job_title,
-                    "companyName": e.company_name,
-                    "description": e.description,
-                }
-                for e in user.experiences
-            ],
-            "education": [
-                {
-                    "degree": edu.degree,
-                    "fieldOfStudy": edu.field_of_study,
-                    "institution": edu.institution,
-                }
-                for edu in user.educations
-            ],
-            "salaryExpectation": {
-                "min": user.salary.min_salary if user.salary else 0,
-                "max": user.salary.max_salary if user.salary else 0,
-            },
-            "certifications": [
-                d.file_name
-                for d in user.documents
-                if d.type == "certificate"
-            ],
-        }
+    reused, to_score = split_reusable(db, context, force=payload.force)
+    response.headers["X-Screening-Reused"] = str(len(reused))
+    response.headers["X-Screening-Recomputed"] = str(len(to_score))
 
-        candidate_text = build_candidate_text(candidate_dict)
+    ai_results = score_candidates_with_llm(
+        job_text=context["job_text"],
+        candidates_data=llm_candidates(to_score),
+    ) if to_score else []
 
-        candidates_for_matching.append({
-            "id": user.id,
-            "name": user.full_name,
-            "text": candidate_text,
-        })
+    sorted_results = sorted(
+        reused + ai_results,
+        key=lambda x: x["skor"],
+        reverse=True
+    )
 
     # =========================
-    # 4️⃣ SEMANTIC MATCHING
+    # 6️⃣ SAVE TO DATABASE
     # =========================
-    ranked_candidates = match_candidates(
-        job_text=job_text,
-        candidates=candidates_for_matching
+    save_screening_results(
+        db,
+        context["application_ids"],
+        ai_results,
+        fingerprints=context["fingerprints"],
     )
 
-    required = job_profile["additional_info"].get("required_candidates", 1)
+    # endpoint blocking: hasil pertama baru terlihat setelah semuanya selesai
+    match_metrics.record("match_ttfr", time.perf_counter() - start)
 
-    # fallback safety
-    if not required or required < 1:
-        required = 1
+    # =========================
+    # 7️⃣ RESPONSE UI
+    # =========================
+    return [to_ui_result(r) for r in sorted_results]
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _match_events(payload: AIMatchRequest):
+    """
+    Event SSE /ai/match/stream:
+    ranking (hasil semantik, secepatnya) -> verdict (per kandidat,
+    begitu LLM selesai) -> summary (setelah disimpan ke database).
+    """
+    start = time.perf_counter()
+
+    # session sendiri: generator tetap berjalan setelah handler return
+    db = SessionLocal()
+    try:
+        try:
+            context = build_shortlist(
+                db,
+                payload.job_id,
+                max_salary=payload.max_salary,
+                location=payload.location,
+            )
+        except ValueError as e:
+            yield _sse("error", {"detail": str(e)})
+            return
+
+        reused, to_score = split_reusable(db, context, force=payload.force)
+
+        ttfr = time.perf_counter() - start
+        match_metrics.record("stream_ttfr", ttfr)
+        yield _sse("ranking", {
+            "prefilter": context["prefilter"],
+            "reuse": context["reuse"],
+            "candidates": [
+                {
+                    "candidate": {
+                        "id": c["id"],
+                        "user": {
+                            "name": c["name"],
+                            "email": "",
+                            "avatarUrl": ""
+                        }
+                    },
+                    "semanticScore": c["semantic_score"],
+                    "lexicalScore": c["lexical_score"],
+                    "matchScore": c["match_score"],
+                }
+                for c in context["shortlist"]
+            ],
+        })
 
-    limit = required * 2
+        # verdict yang masih valid langsung dikirim, sisanya menunggu LLM
+        for r in reused:
+            yield _sse("verdict", to_ui_result(r))
+
+        results = []
+        if to_score:
+            for batch in iter_llm_scores(context["job_text"], llm_candidates(to_score)):
+                if not results and batch:
+                    match_metrics.record("stream_first_verdict", time.perf_counter() - start)
+                for r in batch:
+                    results.append(r)
+                    yield _sse("verdict", to_ui_result(r))
+
+        saved = save_screening_results(
+            db,
+            context["application_ids"],
+            results,
+            fingerprints=context["fingerprints"],
+        )
+        results = sorted(reused + results, key=lambda x: x["skor"], reverse=True)
+
+        total = time.perf_counter() - start
+        match_metrics.record("stream_total", total)
+        yield _sse("summary", {
+            "saved": saved,
+            "reused": len(reused),
+            "recomputed": len(to_score),
+            "results": [to_ui_result(r) for r in results],
+            "ttfrSeconds": round(ttfr, 3),
+            "totalSeconds": round(total, 3),
+        })
+    except Exception as e:
+        print(f"❌ Stream /ai/match gagal: {e}")
+        db.rollback()
+        yield _sse("error", {"detail": "Screening gagal"})
+    finally:
+        db.close()
 
-    top_candidates = ranked_candidates[:limit]
-    print("Top Candidates:")
-    for c in top_candidates:
-        print(f"Candidate ID: {c['id']}, Name: {c['name']}")
-        print("Text Preview:")
-        print(c["text"][:300] + "...\n")
 
-    # =========================
-    # 5️⃣ LLM HR REASONING
-    # =========================
-    ai_results = score_candidates_with_llm(
-        job_text=job_text,
-        candidates_data=[
-            {
-                "id": c["id"],
-                "nama": c["name"],
-                "profile_text": c["text"],
-            }
-            for c in top_candidates
-        ],
+@router.post("/match/stream")
+def ai_match_stream(
+    payload: AIMatchRequest,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Versi streaming /ai/match (Server-Sent Events): ranking semantik
+    dikirim lebih dulu, lalu verdict LLM satu per satu.
+    """
+    if current_user.role != "hrd":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    return StreamingResponse(
+        _match_events(payload),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    sorted_results = sorted(
-        ai_results,
-        key=lambda x: x["skor"],
-        reverse=True
+
+@router.post("/runs", status_code=202)
+def create_screening_run(
+    payload: AIMatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Mode job untuk /ai/match: langsung mengembalikan id run,
+    pipeline dijalankan worker background. Poll GET /ai/runs/{id}.
+    """
+    if current_user.role != "hrd":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    if not db.get(JobPosting, payload.job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    run = ScreeningRun(
+        job_id=payload.job_id,
+        requested_by=current_user.id,
+        status="queued",
+        max_salary=payload.max_salary,
+        location=payload.location,
+        force=payload.force,
     )
+    db.add(run)
+    db.commit()
 
-    # =========================
-    # 6️⃣ SAVE TO DATABASE
-    # =========================
-    for r in sorted_results:
-        application = next(
-            (app for app in applications if app.user.id == int(r["id"])),
-            None
-        )
-        if not application:
-            continue
+    screening_runner.submit(run.id)
+    return {"runId": run.id, "status": run.status}
 
-        status = map_llm_recommendation(r["rekomendasi"])
 
-        existing = (
-            db.query(AIScreeningResult)
-            .filter(AIScreeningResult.application_id == application.id)
-            .first()
-        )
+@router.get("/runs/{run_id}")
+def get_screening_run(
+    run_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role != "hrd":
+        raise HTTPException(status_code=403, detail="Forbidden")
 
-        if existing:
-            existing.fit_score = r["skor"]
-            existing.summary = r["analisis_singkat"]
-            existing.recommendation_status = status
-            existing.confidence = r["skor"] / 100
-            existing.reason = r["rekomendasi"]
-        else:
-            db.add(
-                AIScreeningResult(
-                    application_id=application.id,
-                    fit_score=r["skor"],
-                    summary=r["analisis_singkat"],
-                    recommendation_status=status,
-                    confidence=r["skor"] / 100,
-                    reason=r["rekomendasi"],
-                )
-            )
+    run = db.get(ScreeningRun, run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    return {
+        "runId": run.id,
+        "jobId": run.job_id,
+        "status": run.status,
+        "stage": run.stage,
+        "progress": {
+            "scored": run.scored_candidates or 0,
+            "total": run.total_candidates or 0,
+            "reused": run.reused_candidates or 0,
+        },
+        "results": json.loads(run.results) if run.results else None,
+        "error": run.error,
+        "createdAt": run.created_at,
+        "startedAt": run.started_at,
+        "finishedAt": run.finished_at,
+    }
+
+
+@router.get("/metrics")
+def ai_metrics(current_user: User = Depends(get_current_user)):
+    """Latensi /ai/match (TTFR, verdict pertama, total) + statistik LLM."""
+    if current_user.role != "hrd":
+        raise HTTPException(status_code=403, detail="Forbidden")
 
-    db.commit()
+    return {
+        "match": match_metrics.stats(),
+        "llm": llm_client.stats(),
+        "llm_cache": llm_store.stats(),
+    }
+
+
+@router.post("/talent-search")
+def ai_talent_search(
+    payload: AITalentSearchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Ranking SEMUA kandidat (bukan hanya pelamar) terhadap satu lowongan,
+    memakai matriks embedding talent pool di memori.
+    """
+    if current_user.role != "hrd":
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    try:
+        _, _, job_vector = get_job_embedding(db, payload.job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    # biasanya sudah dimuat saat warm-up startup
+    load_candidate_pool()
+
+    start = time.perf_counter()
+    hits = candidate_pool.search(job_vector, payload.top_k)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"🔎 Talent search job={payload.job_id}: {len(candidate_pool)} kandidat dalam {elapsed_ms:.1f} ms")
 
-    # =========================
-    # 7️⃣ RESPONSE UI
-    # =========================
     return [
         {
             "candidate": {
-                "id": r["id"],
+                "id": candidate_id,
                 "user": {
-                    "name": r["nama"],
+                    "name": name,
                     "email": "",
                     "avatarUrl": ""
                 }
             },
-            "fitScore": r["skor"],
-            "summary": r["analisis_singkat"],
-            "screeningRecommendation": {
-                "status": map_llm_recommendation(r["rekomendasi"]),
-                "confidence": r["skor"] / 100,
-                "reason": r["rekomendasi"]
-            }
+            "semanticScore": round(score * 100, 2),
         }
-        for r in sorted_results
+        for candidate_id, name, score in hits
     ]
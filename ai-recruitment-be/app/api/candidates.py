@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session,joinedload
-from typing import List
+from typing import List, Literal, Optional
 from fastapi import Request
 
 from app.core.database import get_db
@@ -21,26 +22,97 @@ from app.schemas.request import (
 
 from app.schemas.response import CandidateManagementResponse
 from app.models.application import Application
+from app.models.application_semantic_score import ApplicationSemanticScore
 from app.core.database import get_db
 from app.api.deps import get_current_user
+from app.models.job_posting import JobPosting
+from app.services.job_pool import job_pool, load_job_pool
+from app.services.lexical_index import refresh_lexical
+from app.services.reembed import reembed_queue
+from app.services.talent_pool import candidate_query, embed_users
 
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 
 
 @router.get("/management", response_model=List[CandidateManagementResponse])
-def get_candidates(db: Session = Depends(get_db)):
-    applications = (
+def get_candidates(
+    job_id: Optional[int] = None,
+    sort: Optional[Literal["semantic_score"]] = None,
+    min_semantic_score: Optional[float] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    sort=semantic_score / min_semantic_score memakai skor tersimpan dari
+    run /ai/match terakhir (index job_id + semantic_score), tanpa embed ulang.
+    limit/offset memaginasi kandidat (user), bukan baris application.
+    """
+    use_score = sort == "semantic_score" or min_semantic_score is not None
+
+    def apply_filters(query):
+        if job_id is not None:
+            query = query.filter(Application.job_id == job_id)
+
+        if use_score:
+            query = query.outerjoin(
+                ApplicationSemanticScore,
+                ApplicationSemanticScore.application_id == Application.id,
+            )
+            if min_semantic_score is not None:
+                query = query.filter(ApplicationSemanticScore.semantic_score >= min_semantic_score)
+                if job_id is not None:
+                    # range scan di index (job_id, semantic_score)
+                    query = query.filter(ApplicationSemanticScore.job_id == job_id)
+
+        return query
+
+    # =========================
+    # HALAMAN KANDIDAT
+    # =========================
+    # satu kandidat bisa punya beberapa application → paginasi per user,
+    # diurutkan skor tertinggi dari application-nya
+    user_ids = None
+    if limit is not None:
+        page = apply_filters(db.query(Application.user_id)).group_by(Application.user_id)
+        if sort == "semantic_score":
+            # NULL (belum pernah di-match) otomatis di akhir untuk DESC di MySQL
+            page = page.order_by(
+                func.max(ApplicationSemanticScore.semantic_score).desc(),
+                func.min(Application.id),
+            )
+        else:
+            page = page.order_by(func.min(Application.id))
+
+        user_ids = [user_id for user_id, in page.offset(offset).limit(limit).all()]
+        if not user_ids:
+            return []
+
+    query = apply_filters(
         db.query(Application)
         .options(
             joinedload(Application.user),
             joinedload(Application.job),
             joinedload(Application.stages),
             joinedload(Application.ai_result),  # 🔥 TAMBAHAN
+            joinedload(Application.semantic_score),
         )
-        .all()
     )
 
+    if user_ids is not None:
+        query = query.filter(Application.user_id.in_(user_ids))
+
+    if sort == "semantic_score":
+        query = query.order_by(
+            ApplicationSemanticScore.semantic_score.desc(),
+            Application.id,
+        )
+    else:
+        query = query.order_by(Application.id)
+
+    applications = query.all()
+
     result = {}
 
     for app in applications:
@@ -76,8 +148,19 @@ def get_candidates(db: Session = Depends(get_db)):
                 }
                 if app.ai_result else None
             ),
+            "semanticScore": (
+                app.semantic_score.semantic_score
+                if app.semantic_score else None
+            ),
+            "matchScore": (
+                app.semantic_score.match_score
+                if app.semantic_score else None
+            ),
         })
 
+    if user_ids is not None:
+        return [result[user_id] for user_id in user_ids if user_id in result]
+
     return list(result.values())
 
 
@@ -188,6 +271,68 @@ def get_candidate(candidate_id: int, db: Session = Depends(get_db)):
         "applicationHistory": applications,
     }
 
+@router.get("/{candidate_id}/recommended-jobs")
+def get_recommended_jobs(
+    candidate_id: int,
+    limit: int = 10,
+    db: Session = Depends(get_db),
+):
+    """
+    Rekomendasi lowongan published untuk kandidat:
+    embedding profil kandidat x matriks vektor semua job.
+    """
+    user = candidate_query(db).filter(User.id == candidate_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    load_job_pool()
+
+    vectors = embed_users([user])[1]
+    hits = job_pool.search(vectors[0], limit)
+    if not hits:
+        return []
+
+    jobs = {
+        job.id: job
+        for job in (
+            db.query(JobPosting)
+            .options(
+                joinedload(JobPosting.skills),
+                joinedload(JobPosting.certifications),
+            )
+            .filter(
+                JobPosting.id.in_([job_id for job_id, _ in hits]),
+                JobPosting.status == "published",
+            )
+            .all()
+        )
+    }
+
+    result = []
+    for job_id, score in hits:
+        job = jobs.get(job_id)
+        if not job:
+            continue
+
+        result.append({
+            "id": job.id,
+            "title": job.title,
+            "department": job.department,
+            "employment_type": job.employment_type,
+            "location": job.location,
+            "description": job.description,
+            "min_education": job.min_education,
+            "min_experience_years": job.min_experience_years,
+            "closing_date": job.closing_date,
+            "required_candidates": job.required_candidates,
+            "status": job.status,
+            "skills": [s.skill_name for s in job.skills],
+            "certifications": [c.certification_name for c in job.certifications],
+            "matchScore": round(score * 100, 2),
+        })
+
+    return result
+
 @router.put("/{candidate_id}/documents-debug")
 async def save_documents_debug(candidate_id: int, request: Request):
     body = await request.json()
@@ -217,6 +362,8 @@ def update_candidate(
     db.commit()
     db.refresh(user)
 
+    reembed_queue.schedule(user_id)
+
     return {"message": "Profil berhasil diperbarui"}
 
 # ======================
@@ -235,6 +382,9 @@ def save_experiences(candidate_id: int, data: list[ExperienceRequest], db: Sessi
             description=d.description
         ))
     db.commit()
+
+    refresh_lexical(db, candidate_id)
+    reembed_queue.schedule(candidate_id)
     return {"message": "Experiences saved"}
 
 
@@ -254,6 +404,8 @@ def save_educations(candidate_id: int, data: list[EducationRequest], db: Session
             end_date=d.endDate
         ))
     db.commit()
+
+    reembed_queue.schedule(candidate_id)
     return {"message": "Educations saved"}
 
 
@@ -266,6 +418,9 @@ def save_skills(candidate_id: int, data: list[SkillRequest], db: Session = Depen
     for d in data:
         db.add(Skill(user_id=candidate_id, name=d.name, level=d.level))
     db.commit()
+
+    refresh_lexical(db, candidate_id)
+    reembed_queue.schedule(candidate_id)
     return {"message": "Skills saved"}
 
 
@@ -296,6 +451,8 @@ def save_salary(
         salary.max_salary = payload.max
 
     db.commit()
+
+    reembed_queue.schedule(candidate_id)
     return {"message": "Salary updated"}
 
 
@@ -320,6 +477,8 @@ def save_documents(
         ))
 
     db.commit()
+
+    reembed_queue.schedule(candidate_id)
     return {"message": "Documents saved"}
 
 
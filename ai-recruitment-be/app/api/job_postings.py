@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session, joinedload
 from typing import List
+from datetime import datetime
 
 from app.core.database import get_db
 from app.models.job_posting import JobPosting
@@ -10,6 +11,8 @@ from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.job_skill import JobSkill
 from app.models.job_certification import JobCertification
+from app.services.job_pool import job_pool
+from app.services.reembed import job_reembed_queue
 
 router = APIRouter(
     prefix="/job-postings",
@@ -123,6 +126,10 @@ def create_job(
     db.add(job)
     db.commit()
     db.refresh(job)
+
+    # embedding job + job pool di-update di background (model tidak
+    # dimuat di thread request); matching me-refresh vektornya secara lazy
+    job_reembed_queue.schedule(job.id)
     return job
 
 @router.put("/{job_id}", response_model=JobPostingResponse)
@@ -157,8 +164,39 @@ def update_job(
     for cert in payload.certifications:
         job.certifications.append(JobCertification(certification_name=cert))
 
+    # perubahan skills/certs saja tidak memicu onupdate
+    job.updated_at = datetime.utcnow()
+
     db.commit()
     db.refresh(job)
+
+    # embedding job + job pool di-update di background (model tidak
+    # dimuat di thread request); matching me-refresh vektornya secara lazy
+    job_reembed_queue.schedule(job.id)
+    return job
+
+@router.put("/{job_id}/close", response_model=JobPostingResponse)
+def close_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "hrd":
+        raise HTTPException(status_code=403)
+
+    job = db.query(JobPosting).filter(
+        JobPosting.id == job_id,
+        JobPosting.hrd_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job.status = "closed"
+    db.commit()
+    db.refresh(job)
+
+    job_pool.remove(job.id)
     return job
 
 # =========================
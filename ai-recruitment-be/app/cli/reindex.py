@@ -0,0 +1,226 @@
+"""
+Reindex seluruh kandidat ke vector store (Chroma).
+
+- Kandidat di-stream dari MySQL per chunk (keyset pagination, relasi eager-loaded)
+- Teks dirender dengan process_candidates_to_documents
+- Encoding disebar ke process pool (satu model per proses), cache embedding dipakai
+- Hasil ditulis ke Chroma per batch besar (--write-batch); checkpoint disimpan
+  setiap kali batch ditulis, jadi crash paling banyak mengulang satu write batch
+
+Jalankan dari folder ai-recruitment-be:
+    python -m app.cli.reindex --workers 4
+    python -m app.cli.reindex --resume      # lanjut setelah crash
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.embedding import CHROMA_PATH, process_candidates_to_documents
+from app.services.embedding_cache import embedding_key, embedding_store
+from app.services.matching import build_candidate_dict
+from app.services.model_registry import model_key
+from app.services.talent_pool import candidate_query
+
+COLLECTION_NAME = "langchain"  # default collection langchain_chroma
+DEFAULT_CHECKPOINT = "./vector_index/reindex_checkpoint.json"
+
+
+# =========================
+# WORKER (PROCESS POOL)
+# =========================
+def _init_worker(threads: int):
+    import torch
+
+    torch.set_num_threads(threads)
+
+    from app.services.model_registry import get_model
+    get_model()
+
+
+def _encode_batch(texts: List[str]) -> np.ndarray:
+    from app.services.batching import encode_batched
+    from app.services.model_registry import get_model
+
+    return encode_batched(get_model(), texts)
+
+
+# =========================
+# CHECKPOINT
+# =========================
+def load_checkpoint(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"last_id": 0, "processed": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, state: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # tulis atomik agar checkpoint tidak korup jika proses mati di tengah
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+# =========================
+# PIPELINE
+# =========================
+def iter_candidate_chunks(db, start_after: int, chunk_size: int):
+    last_id = start_after
+    while True:
+        users = (
+            candidate_query(db)
+            .filter(User.id > last_id)
+            .order_by(User.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not users:
+            return
+
+        last_id = users[-1].id
+        yield last_id, [build_candidate_dict(u) for u in users]
+        db.expunge_all()
+
+
+def encode_documents(executor, texts: List[str], encode_batch: int) -> np.ndarray:
+    """
+    Ambil embedding dari cache; miss di-encode paralel di process pool.
+    """
+    keys = [embedding_key(t, model_key()) for t in texts]
+    cached = embedding_store.get_many(keys)
+
+    vectors: Dict[int, np.ndarray] = {}
+    missing = []
+    for i, key in enumerate(keys):
+        value = cached.get(key)
+        if value is None:
+            missing.append(i)
+        else:
+            vectors[i] = np.frombuffer(value, dtype=np.float32)
+
+    batches = [missing[i:i + encode_batch] for i in range(0, len(missing), encode_batch)]
+    results = executor.map(_encode_batch, [[texts[i] for i in b] for b in batches])
+
+    fresh = {}
+    for batch, encoded in zip(batches, results):
+        for i, vector in zip(batch, encoded):
+            vectors[i] = vector
+            fresh[keys[i]] = vector.tobytes()
+    embedding_store.put_many(fresh)
+
+    return np.stack([vectors[i] for i in range(len(texts))])
+
+
+def write_batch(collection, docs, vectors: np.ndarray) -> None:
+    candidate_ids = [d.metadata["candidate_id"] for d in docs]
+
+    # hapus dokumen lama kandidat ini (mis. dari update_candidate_embedding)
+    collection.delete(where={"candidate_id": {"$in": candidate_ids}})
+    collection.upsert(
+        ids=[f"candidate-{cid}" for cid in candidate_ids],
+        embeddings=vectors.tolist(),
+        documents=[d.page_content for d in docs],
+        metadatas=[
+            {k: v for k, v in d.metadata.items() if v is not None}
+            for d in docs
+        ],
+    )
+
+
+def main():
+    cpu = os.cpu_count() or 1
+
+    parser = argparse.ArgumentParser(description="Reindex embedding semua kandidat ke Chroma")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="kandidat per query DB")
+    parser.add_argument("--workers", type=int, default=max(1, cpu // 2))
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    parser.add_argument("--encode-batch", type=int, default=256, help="teks per task process pool")
+    parser.add_argument("--write-batch", type=int, default=5000, help="dokumen per upsert Chroma")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--resume", action="store_true", help="lanjut dari checkpoint terakhir")
+    args = parser.parse_args()
+
+    import chromadb
+
+    threads = args.threads_per_worker or max(1, cpu // args.workers)
+    state = load_checkpoint(args.checkpoint) if args.resume else {"last_id": 0, "processed": 0}
+
+    db = SessionLocal()
+    collection = chromadb.PersistentClient(path=CHROMA_PATH).get_or_create_collection(COLLECTION_NAME)
+
+    total = (
+        db.query(User)
+        .filter(User.role == "candidate", User.id > state["last_id"])
+        .count()
+    )
+    print(f"🔁 Reindex {total} kandidat (mulai setelah id={state['last_id']}, {args.workers} worker x {threads} thread)")
+
+    start = time.perf_counter()
+    done = 0
+    pending_docs, pending_vectors = [], []
+
+    def flush(last_id: int):
+        nonlocal pending_docs, pending_vectors
+        if pending_docs:
+            write_batch(collection, pending_docs, np.concatenate(pending_vectors))
+        state["processed"] += len(pending_docs)
+        state["last_id"] = last_id
+        save_checkpoint(args.checkpoint, state)
+        pending_docs, pending_vectors = [], []
+
+    try:
+        # spawn: worker tidak mewarisi koneksi MySQL milik session di proses induk
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(threads,),
+        ) as executor:
+            for last_id, candidates in iter_candidate_chunks(db, state["last_id"], args.chunk_size):
+                docs = process_candidates_to_documents(candidates)
+                vectors = encode_documents(
+                    executor,
+                    [d.page_content for d in docs],
+                    args.encode_batch,
+                )
+
+                pending_docs.extend(docs)
+                pending_vectors.append(vectors)
+                done += len(docs)
+
+                if len(pending_docs) >= args.write_batch:
+                    flush(last_id)
+
+                elapsed = time.perf_counter() - start
+                rate = done / elapsed if elapsed else 0.0
+                eta = (total - done) / rate if rate else 0.0
+                print(f"   {done}/{total} kandidat  {rate:.1f}/detik  ETA {eta / 60:.1f} menit")
+
+            if pending_docs:
+                flush(last_id)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print("=" * 50)
+    print(f"✅ Reindex selesai: {done} kandidat dalam {elapsed:.1f}s ({done / elapsed if elapsed else 0:.1f} kandidat/detik)")
+    print(f"   cache embedding: {embedding_store.stats()}")
+    print(f"   checkpoint     : {args.checkpoint} (last_id={state['last_id']})")
+
+
+if __name__ == "__main__":
+    main()
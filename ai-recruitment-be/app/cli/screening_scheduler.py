@@ -0,0 +1,413 @@
+"""
+Screening terjadwal (mis. tiap malam) untuk semua lowongan berstatus published.
+
+- Pelamar tiap job disaring syarat wajib (sama seperti /ai/match)
+- Profil kandidat unik lintas job dimuat & di-embed SEKALI (satu model, cache embedding)
+- Skor semantik semua pelamar disimpan; hanya pasangan job/profil yang baru
+  atau berubah sejak run terakhir (fingerprint) yang dinilai LLM
+- Budget CPU (thread torch, detik CPU) dan LLM (token prompt, jumlah kandidat);
+  job yang tidak muat ditunda ke run berikutnya
+- Laporan per run: throughput, cache hit embedding & LLM, token LLM
+
+Jalankan dari folder ai-recruitment-be (mis. via cron jam 02:00):
+    python -m app.cli.screening_scheduler
+    python -m app.cli.screening_scheduler --cpu-seconds 1800 --llm-token-budget 500000 --report ./reports/screening.json
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import (
+    SCHEDULER_CPU_SECONDS,
+    SCHEDULER_CPU_THREADS,
+    SCHEDULER_LLM_MAX_CANDIDATES,
+    SCHEDULER_LLM_TOKEN_BUDGET,
+    SCHEDULER_PARALLEL_JOBS,
+)
+from app.core.database import SessionLocal
+from app.models.application import Application
+from app.models.job_posting import JobPosting
+from app.models.user import User
+from app.services.embedding_cache import embedding_store
+from app.services.job_embedding import get_job_embedding
+from app.services.llm_cache import llm_store
+from app.services.llm_client import llm_client
+from app.services.matching import (
+    build_candidate_dict,
+    build_candidate_sections,
+    build_candidate_text,
+    match_candidates,
+)
+from app.services.model_registry import get_model, model_key
+from app.services.profile_embedding import embed_profiles
+from app.services.prompt_packing import pack_candidates
+from app.services.query import (
+    prompt_overhead_tokens,
+    render_candidate,
+    score_candidates_with_llm_async,
+)
+from app.services.screening import (
+    llm_candidates,
+    save_screening_results,
+    save_semantic_scores,
+    select_applicants,
+    shortlist_limit,
+    split_reusable,
+)
+from app.services.talent_pool import candidate_query
+
+
+# =========================
+# 1️⃣ PLAN: JOB PUBLISHED + PELAMAR LOLOS SYARAT WAJIB
+# =========================
+def plan_jobs(db) -> List[dict]:
+    jobs = (
+        db.query(JobPosting.id, JobPosting.title)
+        .filter(JobPosting.status == "published")
+        .order_by(JobPosting.id)
+        .all()
+    )
+
+    plans = []
+    for job_id, title in jobs:
+        plan = {"job_id": job_id, "title": title, "status": "pending", "application_ids": {}}
+        plans.append(plan)
+        try:
+            job_profile, job_text, job_vector = get_job_embedding(db, job_id)
+            applicant_ids, _, considered = select_applicants(db, job_profile)
+
+            plan.update({
+                "job_profile": job_profile,
+                "job_text": job_text,
+                "job_vector": job_vector,
+                "considered": considered,
+                "application_ids": dict(
+                    db.query(Application.user_id, Application.id)
+                    .filter(
+                        Application.job_id == job_id,
+                        Application.user_id.in_(applicant_ids),
+                    )
+                    .all()
+                ) if applicant_ids else {},
+            })
+
+            if not plan["application_ids"]:
+                # bersihkan ranking lama pelamar yang kini tidak lolos
+                save_semantic_scores(db, job_id, {}, [], considered_user_ids=considered)
+                plan["status"] = "empty"
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Job {job_id} gagal direncanakan: {e}")
+            plan.update({"status": "failed", "error": str(e)})
+
+    return plans
+
+
+# =========================
+# 2️⃣ SATU PASS EMBEDDING UNTUK SEMUA JOB
+# =========================
+def embed_candidates(db, user_ids: List[int], chunk_size: int, cpu_deadline: float) -> Dict[int, dict]:
+    """
+    Render & embed profil kandidat unik per chunk. Berhenti lebih awal
+    jika waktu CPU proses melewati cpu_deadline (0 = tanpa batas).
+    """
+    model = get_model()
+    profiles: Dict[int, dict] = {}
+
+    for start in range(0, len(user_ids), chunk_size):
+        if cpu_deadline and time.process_time() >= cpu_deadline:
+            print(f"⏸️ Budget CPU habis: {len(profiles)}/{len(user_ids)} profil ter-embed")
+            break
+
+        users = (
+            candidate_query(db)
+            .filter(User.id.in_(user_ids[start:start + chunk_size]))
+            .all()
+        )
+        candidates = [build_candidate_dict(u) for u in users]
+        texts = [build_candidate_text(c) for c in candidates]
+        vectors = embed_profiles(
+            model,
+            texts,
+            [build_candidate_sections(c) for c in candidates],
+            model_name=model_key(),
+        )
+
+        for user, text, vector in zip(users, texts, vectors):
+            profiles[user.id] = {"name": user.full_name, "text": text, "vector": vector}
+        db.expunge_all()
+
+    return profiles
+
+
+# =========================
+# 3️⃣ RANKING + DETEKSI PERUBAHAN PER JOB
+# =========================
+def rank_job(db, plan: dict, profiles: Dict[int, dict]) -> None:
+    user_ids = [uid for uid in plan["application_ids"] if uid in profiles]
+    ranked = match_candidates(
+        job_text=plan["job_text"],
+        candidates=[
+            {"id": uid, "name": profiles[uid]["name"], "text": profiles[uid]["text"]}
+            for uid in user_ids
+        ],
+        job_embedding=plan["job_vector"],
+        job_skills=plan["job_profile"]["requirements"]["skills"],
+        candidate_embeddings=np.stack([profiles[uid]["vector"] for uid in user_ids]) if user_ids else None,
+    )
+    save_semantic_scores(
+        db,
+        plan["job_id"],
+        plan["application_ids"],
+        ranked,
+        considered_user_ids=plan["considered"],
+    )
+
+    context = {
+        "job_text": plan["job_text"],
+        "application_ids": plan["application_ids"],
+        "shortlist": ranked[:shortlist_limit(plan["job_profile"])],
+    }
+    reused, to_score = split_reusable(db, context)
+
+    plan.update({
+        "ranked": len(ranked),
+        "reused": len(reused),
+        "to_score": to_score,
+        "fingerprints": context["fingerprints"],
+    })
+
+
+def estimate_prompt_tokens(job_text: str, to_score: List[Dict]) -> int:
+    """Token prompt jika semua kandidat dikirim (batas atas; cache hit LLM tidak dihitung)."""
+    _, report = pack_candidates(
+        llm_candidates(to_score),
+        render=render_candidate,
+        overhead_tokens=prompt_overhead_tokens(job_text),
+    )
+    return sum(report["prompt_tokens"])
+
+
+# =========================
+# 4️⃣ LLM LINTAS JOB (PARALEL, DALAM BUDGET)
+# =========================
+def score_jobs(db, plans: List[dict], parallel_jobs: int) -> None:
+    queued = list(plans)
+    running = {}
+
+    while queued or running:
+        while queued and len(running) < parallel_jobs:
+            plan = queued.pop(0)
+            future = llm_client.submit(score_candidates_with_llm_async(
+                plan["job_text"],
+                llm_candidates(plan["to_score"]),
+            ))
+            running[future] = plan
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            plan = running.pop(future)
+            try:
+                results = future.result()
+                plan["saved"] = save_screening_results(
+                    db,
+                    plan["application_ids"],
+                    results,
+                    fingerprints=plan["fingerprints"],
+                )
+                plan["status"] = "screened"
+                print(f"✅ Job {plan['job_id']} ({plan['title']}): {plan['saved']} verdict baru")
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Job {plan['job_id']} gagal dinilai LLM: {e}")
+                plan.update({"status": "failed", "error": str(e)})
+
+
+# =========================
+# RUN
+# =========================
+def run(args) -> dict:
+    if args.cpu_threads:
+        import torch
+
+        torch.set_num_threads(args.cpu_threads)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    cpu_deadline = cpu_start + args.cpu_seconds if args.cpu_seconds else 0.0
+    started_at = datetime.utcnow()
+
+    embed_hits, embed_misses = embedding_store.hits, embedding_store.misses
+    llm_hits, llm_misses = llm_store.hits, llm_store.misses
+    llm_before = llm_client.stats()
+
+    db = SessionLocal()
+    try:
+        plans = plan_jobs(db)
+        active = [p for p in plans if p["status"] == "pending"]
+        user_ids = sorted({uid for p in active for uid in p["application_ids"]})
+        print(
+            f"🗓️ {len(plans)} job published, {len(active)} dengan pelamar, "
+            f"{sum(len(p['application_ids']) for p in active)} lamaran, {len(user_ids)} profil unik"
+        )
+
+        embed_start = time.perf_counter()
+        profiles = embed_candidates(db, user_ids, args.chunk_size, cpu_deadline)
+        embed_seconds = time.perf_counter() - embed_start
+        embedding_complete = len(profiles) == len(user_ids) or not (
+            cpu_deadline and time.process_time() >= cpu_deadline
+        )
+
+        token_budget = args.llm_token_budget
+        candidate_budget = args.llm_max_candidates
+        estimated_tokens = 0
+        to_llm = []
+
+        for plan in active:
+            if not embedding_complete and any(uid not in profiles for uid in plan["application_ids"]):
+                plan["status"] = "deferred_cpu"
+                continue
+
+            try:
+                rank_job(db, plan, profiles)
+            except Exception as e:
+                db.rollback()
+                print(f"❌ Job {plan['job_id']} gagal di-ranking: {e}")
+                plan.update({"status": "failed", "error": str(e)})
+                continue
+
+            if not plan["to_score"]:
+                plan["status"] = "unchanged"
+                continue
+
+            tokens = estimate_prompt_tokens(plan["job_text"], plan["to_score"])
+            if tokens > token_budget or len(plan["to_score"]) > candidate_budget:
+                # fingerprint belum diperbarui: otomatis diambil lagi pada run berikutnya
+                plan["status"] = "deferred_llm"
+                continue
+
+            token_budget -= tokens
+            candidate_budget -= len(plan["to_score"])
+            estimated_tokens += tokens
+            to_llm.append(plan)
+
+        llm_start = time.perf_counter()
+        score_jobs(db, to_llm, args.parallel_jobs)
+        llm_seconds = time.perf_counter() - llm_start
+    finally:
+        db.close()
+
+    llm_after = llm_client.stats()
+    wall_seconds = time.perf_counter() - wall_start
+    scored = sum(len(p["to_score"]) for p in to_llm if p["status"] == "screened")
+    pairs = sum(p.get("ranked", 0) for p in plans)
+
+    def count(status: str) -> int:
+        return sum(1 for p in plans if p["status"] == status)
+
+    return {
+        "started_at": started_at.isoformat(),
+        "finished_at": datetime.utcnow().isoformat(),
+        "wall_seconds": round(wall_seconds, 2),
+        "cpu_seconds": round(time.process_time() - cpu_start, 2),
+        "jobs": {
+            "published": len(plans),
+            "screened": count("screened"),
+            "unchanged": count("unchanged"),
+            "empty": count("empty"),
+            "deferred_cpu": count("deferred_cpu"),
+            "deferred_llm": count("deferred_llm"),
+            "failed": count("failed"),
+        },
+        "throughput": {
+            "profiles_embedded": len(profiles),
+            "profiles_per_second": round(len(profiles) / embed_seconds, 1) if embed_seconds else None,
+            "pairs_ranked": pairs,
+            "pairs_per_second": round(pairs / wall_seconds, 1) if wall_seconds else None,
+            "llm_verdicts": scored,
+            "llm_verdicts_per_second": round(scored / llm_seconds, 2) if scored and llm_seconds else None,
+        },
+        "cache": {
+            "embedding_hits": embedding_store.hits - embed_hits,
+            "embedding_misses": embedding_store.misses - embed_misses,
+            "llm_hits": llm_store.hits - llm_hits,
+            "llm_misses": llm_store.misses - llm_misses,
+            "verdicts_reused": sum(p.get("reused", 0) for p in plans),
+        },
+        "llm": {
+            "calls": llm_after["calls"] - llm_before["calls"],
+            "errors": llm_after["errors"] - llm_before["errors"],
+            "prompt_tokens": llm_after["prompt_tokens"] - llm_before["prompt_tokens"],
+            "completion_tokens": llm_after["completion_tokens"] - llm_before["completion_tokens"],
+            "estimated_prompt_tokens": estimated_tokens,
+            "token_budget": args.llm_token_budget,
+        },
+        "per_job": [
+            {
+                "job_id": p["job_id"],
+                "title": p["title"],
+                "status": p["status"],
+                "applicants": len(p["application_ids"]),
+                "reused": p.get("reused", 0),
+                "recomputed": len(p.get("to_score", [])),
+                **({"error": p["error"]} if "error" in p else {}),
+            }
+            for p in plans
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screening terjadwal semua lowongan published")
+    parser.add_argument("--cpu-threads", type=int, default=SCHEDULER_CPU_THREADS, help="thread torch (0 = default)")
+    parser.add_argument("--cpu-seconds", type=float, default=SCHEDULER_CPU_SECONDS, help="batas waktu CPU embedding (0 = tanpa batas)")
+    parser.add_argument("--llm-token-budget", type=int, default=SCHEDULER_LLM_TOKEN_BUDGET, help="batas token prompt LLM per run")
+    parser.add_argument("--llm-max-candidates", type=int, default=SCHEDULER_LLM_MAX_CANDIDATES, help="batas kandidat dinilai LLM per run")
+    parser.add_argument("--parallel-jobs", type=int, default=SCHEDULER_PARALLEL_JOBS, help="job yang dinilai LLM bersamaan")
+    parser.add_argument("--chunk-size", type=int, default=500, help="profil per query DB / pass embedding")
+    parser.add_argument("--report", default=None, help="simpan laporan JSON ke path ini")
+    args = parser.parse_args()
+
+    try:
+        report = run(args)
+    finally:
+        llm_client.close()
+
+    jobs, throughput, cache, llm = report["jobs"], report["throughput"], report["cache"], report["llm"]
+    print("=" * 50)
+    print(f"✅ Screening terjadwal selesai dalam {report['wall_seconds']}s (CPU {report['cpu_seconds']}s)")
+    print(
+        f"   job       : {jobs['screened']} dinilai, {jobs['unchanged']} tanpa perubahan, {jobs['empty']} kosong, "
+        f"ditunda {jobs['deferred_cpu']} (CPU) / {jobs['deferred_llm']} (LLM), {jobs['failed']} gagal"
+    )
+    print(
+        f"   throughput: {throughput['profiles_embedded']} profil ({throughput['profiles_per_second']}/detik), "
+        f"{throughput['pairs_ranked']} pasangan, {throughput['llm_verdicts']} verdict LLM"
+    )
+    print(
+        f"   cache     : embedding {cache['embedding_hits']} hit / {cache['embedding_misses']} miss, "
+        f"LLM {cache['llm_hits']} hit / {cache['llm_misses']} miss, {cache['verdicts_reused']} verdict dipakai ulang"
+    )
+    print(
+        f"   LLM       : {llm['calls']} call, token {llm['prompt_tokens']}+{llm['completion_tokens']} "
+        f"(estimasi prompt {llm['estimated_prompt_tokens']}/{llm['token_budget']})"
+    )
+
+    if args.report:
+        directory = os.path.dirname(args.report)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"   laporan   : {args.report}")
+
+
+if __name__ == "__main__":
+    main()
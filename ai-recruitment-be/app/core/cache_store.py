@@ -0,0 +1,144 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+def _chunks(items: List[str], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class SqliteCacheStore:
+    """
+    Key-value store persisten (file SQLite lokal) dengan eviction LRU
+    berdasarkan jumlah item dan TTL opsional.
+    Dipakai bersama oleh cache embedding dan cache hasil LLM.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "cache",
+        max_items: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.path = path
+        self.table = table
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, "
+                "value BLOB NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed "
+                f"ON {self.table} (accessed_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, bytes] = {}
+        if not keys:
+            return found
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for chunk in _chunks(keys, 500):
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, value, created_at FROM {self.table} "
+                    f"WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                        continue
+                    found[key] = value
+
+            if found:
+                conn.executemany(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def put_many(self, items: Dict[str, bytes]) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items.items()],
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds is not None:
+            cur = conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            self.evictions += max(cur.rowcount, 0)
+
+        if self.max_items is not None:
+            count = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            overflow = count - self.max_items
+            if overflow > 0:
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN ("
+                    f"SELECT key FROM {self.table} "
+                    "ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connect().execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "items": self.count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
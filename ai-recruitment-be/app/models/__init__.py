@@ -10,5 +10,8 @@ from .application_stage import ApplicationStage
 from .job_posting import JobPosting
 from .job_skill import JobSkill
 from .job_certification import JobCertification
+from .job_embedding import JobEmbedding
+from .screening_run import ScreeningRun
 
 
+from .application_semantic_score import ApplicationSemanticScore
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, Text, Enum, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, Text, Enum, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -25,6 +25,12 @@ class AIScreeningResult(Base):
 
     confidence = Column(Float)
     reason = Column(Text)
+
+    # sha256 teks job (+ prompt & model) dan teks profil saat verdict dibuat;
+    # pasangan yang tidak berubah tidak di-score ulang oleh /ai/match
+    job_fingerprint = Column(String(64))
+    profile_fingerprint = Column(String(64))
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     application = relationship("Application", back_populates="ai_result")
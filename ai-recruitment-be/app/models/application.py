@@ -39,3 +39,10 @@ class Application(Base):
         uselist=False,
         cascade="all, delete-orphan",
     )
+
+    semantic_score = relationship(
+        "ApplicationSemanticScore",
+        back_populates="application",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+class ApplicationSemanticScore(Base):
+    __tablename__ = "application_semantic_scores"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    application_id = Column(
+        Integer,
+        ForeignKey("applications.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    job_id = Column(
+        Integer,
+        ForeignKey("job_postings.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # skor 0-100 dari match_candidates untuk SEMUA pelamar yang lolos prefilter
+    semantic_score = Column(Float, nullable=False)
+    lexical_score = Column(Float)
+    match_score = Column(Float)
+
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    application = relationship("Application", back_populates="semantic_score")
+
+    __table_args__ = (
+        # ranking per job (/candidates/management?job_id=..&sort=semantic_score)
+        Index("ix_semantic_scores_job_score", "job_id", "semantic_score"),
+    )
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+class JobEmbedding(Base):
+    __tablename__ = "job_embeddings"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    job_id = Column(
+        Integer,
+        ForeignKey("job_postings.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+
+    model_name = Column(String(150), nullable=False)
+    text_hash = Column(String(64), nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 bytes
+
+    # updated_at JobPosting saat vektor dibuat
+    job_updated_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    job = relationship("JobPosting", back_populates="embedding")
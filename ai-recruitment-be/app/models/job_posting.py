@@ -72,4 +72,10 @@ class JobPosting(Base):
         back_populates="job",
         cascade="all, delete-orphan",
     )
+    embedding = relationship(
+        "JobEmbedding",
+        back_populates="job",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
@@ -0,0 +1,44 @@
+from sqlalchemy import Boolean, Column, Integer, String, Text, Enum, ForeignKey, DateTime
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from app.core.database import Base
+
+class ScreeningRun(Base):
+    __tablename__ = "screening_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    job_id = Column(
+        Integer,
+        ForeignKey("job_postings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    requested_by = Column(Integer, ForeignKey("users.id"))
+
+    status = Column(
+        Enum("queued", "running", "completed", "failed", name="screening_run_status_enum"),
+        nullable=False,
+        default="queued",
+    )
+    stage = Column(String(30))
+
+    # filter opsional dari AIMatchRequest
+    max_salary = Column(Integer)
+    location = Column(String(100))
+    force = Column(Boolean, default=False)
+
+    total_candidates = Column(Integer, default=0)
+    scored_candidates = Column(Integer, default=0)
+    reused_candidates = Column(Integer, default=0)
+
+    results = Column(Text)  # JSON list hasil untuk UI
+    error = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    # diperbarui tiap progres; run "running" dengan heartbeat basi diambil alih saat startup
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    job = relationship("JobPosting")
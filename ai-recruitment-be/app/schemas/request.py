@@ -91,4 +91,13 @@ class ApplyJobRequest(BaseModel):
     job_id: int
 
 class AIMatchRequest(BaseModel):
-    job_id: int
\ No newline at end of file
+    job_id: int
+    # filter wajib opsional (disaring di SQL sebelum embedding)
+    max_salary: Optional[int] = None
+    location: Optional[str] = None
+    # True: score ulang semua kandidat walau job & profil tidak berubah
+    force: bool = False
+
+class AITalentSearchRequest(BaseModel):
+    job_id: int
+    top_k: int = 20
@@ -69,6 +69,9 @@ class ApplicationHistoryResponse(BaseModel):
     position: str
     stages: List[ApplicationStageResponse]
     aiScreening: Optional[AIScreeningResponse]
+    # skor ranking dari run /ai/match terakhir (semua pelamar, bukan hanya shortlist LLM)
+    semanticScore: Optional[float] = None
+    matchScore: Optional[float] = None
 
 class CandidateResponse(BaseModel):
     id: str
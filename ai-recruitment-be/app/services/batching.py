@@ -0,0 +1,94 @@
+from typing import List
+
+import numpy as np
+
+from app.core.config import EMBEDDING_BATCH_SIZE, EMBEDDING_TOKEN_BUDGET
+
+
+def token_lengths(model, texts: List[str]) -> np.ndarray:
+    """
+    Panjang token tiap teks (setelah truncation ke max_seq_length model).
+    Fallback ke estimasi ~4 karakter/token jika model tidak punya tokenizer.
+    """
+    max_length = getattr(model, "max_seq_length", None) or 512
+    tokenizer = getattr(model, "tokenizer", None)
+
+    if tokenizer is None:
+        return np.minimum(
+            np.array([len(t) // 4 + 2 for t in texts], dtype=np.int64),
+            max_length,
+        )
+
+    encoded = tokenizer(
+        texts,
+        add_special_tokens=True,
+        truncation=True,
+        max_length=max_length,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+    )
+    return np.array([len(ids) for ids in encoded["input_ids"]], dtype=np.int64)
+
+
+def plan_batches(
+    lengths: np.ndarray,
+    token_budget: int = EMBEDDING_TOKEN_BUDGET,
+    max_batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> List[np.ndarray]:
+    """
+    Kelompokkan index teks menjadi batch dengan panjang mirip.
+    Teks diurutkan dari yang terpanjang, lalu batch ditutup saat
+    (token terpanjang x jumlah teks) melewati token_budget.
+    """
+    order = np.argsort(-lengths, kind="stable")
+
+    batches = []
+    current: List[int] = []
+    current_max = 0
+    for i in order:
+        length = int(lengths[i])
+        padded = max(current_max, length) * (len(current) + 1)
+        if current and (padded > token_budget or len(current) >= max_batch_size):
+            batches.append(np.array(current))
+            current, current_max = [], 0
+
+        current.append(int(i))
+        current_max = max(current_max, length)
+
+    if current:
+        batches.append(np.array(current))
+    return batches
+
+
+def padding_efficiency(lengths: np.ndarray, batches: List[np.ndarray]) -> float:
+    """Porsi token asli dibanding total token setelah padding."""
+    padded = sum(int(lengths[b].max()) * len(b) for b in batches if len(b))
+    return float(lengths.sum()) / padded if padded else 1.0
+
+
+def encode_batched(
+    model,
+    texts: List[str],
+    token_budget: int = EMBEDDING_TOKEN_BUDGET,
+    max_batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Encode teks per bucket panjang token, lalu kembalikan
+    matriks (n, dim) float32 ternormalisasi dalam urutan input.
+    """
+    dim = model.get_sentence_embedding_dimension()
+    if not texts:
+        return np.empty((0, dim), dtype=np.float32)
+
+    lengths = token_lengths(model, texts)
+    out = np.empty((len(texts), dim), dtype=np.float32)
+
+    for batch in plan_batches(lengths, token_budget, max_batch_size):
+        out[batch] = model.encode(
+            [texts[i] for i in batch],
+            batch_size=len(batch),
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+
+    return out
@@ -2,16 +2,43 @@ import os
 import shutil
 from typing import List, Dict
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 from dotenv import load_dotenv
 # from data import candidates_dummy
 
+from app.core.config import EMBEDDING_MODEL_NAME
+from app.services.embedding_cache import encode_texts
+from app.services.model_registry import get_model, model_key
+
 # Load environment variables
 load_dotenv()
 
 CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
-MODEL_NAME = "intfloat/multilingual-e5-small"
+MODEL_NAME = EMBEDDING_MODEL_NAME
+
+
+class RegistryEmbeddings(Embeddings):
+    """
+    Adapter LangChain di atas model dari registry,
+    supaya Chroma memakai instance model yang sama dengan matching.
+    """
+
+    def __init__(self, model_name: str = MODEL_NAME):
+        self.model_name = model_name
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return encode_texts(
+            get_model(self.model_name),
+            texts,
+            model_name=model_key(self.model_name),
+        ).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+embedding_model = RegistryEmbeddings()
 
 def pretty_print_documents(docs: List[Document]):
     print(f"\n{'='*50}")
@@ -85,13 +112,6 @@ def generate_vector_store(docs, reset=False):
     if reset and os.path.exists(CHROMA_PATH):
         shutil.rmtree(CHROMA_PATH)
   
-    # print(f"🧠 Memuat Embedding Model: {MODEL_NAME}...")
-    embedding_model = HuggingFaceEmbeddings(
-        model_name=MODEL_NAME,
-        model_kwargs={"device": "cpu"},
-        encode_kwargs={"normalize_embeddings": True}
-    )
-
     # 4. Simpan ke ChromaDB
     
     try:
@@ -105,12 +125,6 @@ def generate_vector_store(docs, reset=False):
         print(f"❌ Terjadi kesalahan: {e}")
 
 def update_candidate_embedding(candidate: Dict):
-    embedding_model = HuggingFaceEmbeddings(
-        model_name=MODEL_NAME,
-        model_kwargs={"device": "cpu"},
-        encode_kwargs={"normalize_embeddings": True}
-    )
-
     db = Chroma(
         persist_directory=CHROMA_PATH,
         embedding_function=embedding_model
@@ -121,6 +135,9 @@ def update_candidate_embedding(candidate: Dict):
 
     # 2. Buat embedding baru
     docs = process_candidates_to_documents([candidate])
+    for doc in docs:
+        # Chroma menolak metadata None (mis. location / email kosong)
+        doc.metadata = {k: v for k, v in doc.metadata.items() if v is not None}
     db.add_documents(docs)
 
 
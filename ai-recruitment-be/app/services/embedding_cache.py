@@ -0,0 +1,79 @@
+import hashlib
+from typing import List
+
+import numpy as np
+
+from app.core.cache_store import SqliteCacheStore
+from app.services.batching import encode_batched
+from app.core.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MAX_ITEMS,
+    EMBEDDING_CACHE_PATH,
+)
+
+embedding_store = SqliteCacheStore(
+    EMBEDDING_CACHE_PATH,
+    table="embeddings",
+    max_items=EMBEDDING_CACHE_MAX_ITEMS,
+)
+
+
+def embedding_key(text: str, model_name: str) -> str:
+    """
+    Key cache = hash(model + teks). Profil yang tidak berubah
+    selalu menghasilkan key yang sama.
+    """
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def encode_texts(
+    model,
+    texts: List[str],
+    model_name: str,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Encode list teks menjadi matriks (n, dim) float32 ternormalisasi.
+    Hanya teks yang belum ada di cache yang di-encode oleh model.
+    """
+    if not texts:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    if not EMBEDDING_CACHE_ENABLED:
+        return encode_batched(model, texts, max_batch_size=batch_size)
+
+    keys = [embedding_key(t, model_name) for t in texts]
+    cached = embedding_store.get_many(keys)
+
+    matrix = np.empty(
+        (len(texts), model.get_sentence_embedding_dimension()),
+        dtype=np.float32,
+    )
+
+    # teks duplikat cukup di-encode sekali
+    missing = {}
+    for i, key in enumerate(keys):
+        value = cached.get(key)
+        if value is None:
+            missing.setdefault(key, []).append(i)
+        else:
+            matrix[i] = np.frombuffer(value, dtype=np.float32)
+
+    if missing:
+        miss_keys = list(missing)
+        encoded = encode_batched(
+            model,
+            [texts[missing[k][0]] for k in miss_keys],
+            max_batch_size=batch_size,
+        )
+
+        for key, vector in zip(miss_keys, encoded):
+            matrix[missing[key]] = vector
+
+        embedding_store.put_many({
+            key: vector.tobytes()
+            for key, vector in zip(miss_keys, encoded)
+        })
+
+    return matrix
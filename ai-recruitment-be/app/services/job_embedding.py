@@ -0,0 +1,96 @@
+import hashlib
+from typing import Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.job_posting import JobPosting
+from app.models.job_embedding import JobEmbedding
+from app.services.matching import (
+    build_job_description_text,
+    job_to_profile_dict,
+)
+from app.services.model_registry import get_model, model_key
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def is_stale(job: JobPosting, job_text: str) -> bool:
+    """
+    Vektor dianggap basi jika model berganti, job di-update
+    setelah vektor dibuat, atau teks job-nya berubah.
+    """
+    row = job.embedding
+    if row is None:
+        return True
+
+    return (
+        row.model_name != model_key()
+        or row.job_updated_at != job.updated_at
+        or row.text_hash != text_hash(job_text)
+    )
+
+
+def refresh_job_embedding(
+    db: Session,
+    job: JobPosting,
+    job_text: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Render teks job, encode sekali, lalu simpan vektor + hash teks
+    ke tabel job_embeddings. Dipanggil saat job dibuat / di-update.
+    """
+    if job_text is None:
+        job_text = build_job_description_text(job_to_profile_dict(job))
+
+    vector = get_model().encode(
+        job_text,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    ).astype(np.float32, copy=False)
+
+    row = job.embedding
+    if row is None:
+        row = JobEmbedding(job_id=job.id)
+        job.embedding = row
+
+    row.model_name = model_key()
+    row.text_hash = text_hash(job_text)
+    row.vector = vector.tobytes()
+    row.job_updated_at = job.updated_at
+
+    db.commit()
+    return vector
+
+
+def get_job_embedding(db: Session, job_id: int) -> Tuple[dict, str, np.ndarray]:
+    """
+    Ambil job profile, teks job dan vektornya.
+    Vektor yang basi / belum ada di-refresh secara lazy.
+    """
+    job = (
+        db.query(JobPosting)
+        .options(
+            joinedload(JobPosting.skills),
+            joinedload(JobPosting.certifications),
+            joinedload(JobPosting.embedding),
+        )
+        .filter(JobPosting.id == job_id)
+        .first()
+    )
+
+    if not job:
+        raise ValueError(f"JobPosting dengan id={job_id} tidak ditemukan")
+
+    job_profile = job_to_profile_dict(job)
+    job_text = build_job_description_text(job_profile)
+
+    if is_stale(job, job_text):
+        print(f"♻️ Refresh embedding job id={job_id}")
+        vector = refresh_job_embedding(db, job, job_text)
+    else:
+        vector = np.frombuffer(job.embedding.vector, dtype=np.float32)
+
+    return job_profile, job_text, vector
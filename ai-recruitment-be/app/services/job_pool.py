@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import List, Tuple
+
+import numpy as np
+from sqlalchemy.orm import selectinload
+
+from app.core.database import SessionLocal
+from app.models.job_posting import JobPosting
+from app.services.job_embedding import is_stale, refresh_job_embedding
+from app.services.matching import build_job_description_text, job_to_profile_dict
+from app.services.vector_index import ExactIndex
+
+
+class JobPool:
+    """
+    Matriks vektor semua lowongan berstatus published, untuk reverse
+    matching (rekomendasi job untuk kandidat). Satu kali vector-matrix
+    product per request; di-update incremental dari endpoint job postings.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.index = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self.index) if self.index is not None else 0
+
+    def upsert(self, job_id: int, vector: np.ndarray) -> None:
+        with self._lock:
+            if self.index is None:
+                self.index = ExactIndex(dim=len(vector), initial_capacity=256)
+            self.index.add([job_id], vector.reshape(1, -1))
+
+    def remove(self, job_id: int) -> None:
+        with self._lock:
+            if self.index is not None:
+                self.index.delete([job_id])
+
+    def sync(self, job: JobPosting, vector: np.ndarray) -> None:
+        """Hanya job published yang boleh direkomendasikan."""
+        if job.status == "published":
+            self.upsert(job.id, vector)
+        else:
+            self.remove(job.id)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            if self.index is None:
+                return []
+            return self.index.search(query, k)
+
+
+job_pool = JobPool()
+_load_lock = threading.Lock()
+
+
+def load_job_pool() -> None:
+    """
+    Isi job pool dari tabel job_embeddings; vektor yang belum ada
+    atau basi di-refresh sekalian.
+    """
+    with _load_lock:
+        if job_pool.loaded:
+            return
+
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            jobs = (
+                db.query(JobPosting)
+                .options(
+                    selectinload(JobPosting.skills),
+                    selectinload(JobPosting.certifications),
+                    selectinload(JobPosting.embedding),
+                )
+                .filter(JobPosting.status == "published")
+                .all()
+            )
+
+            for job in jobs:
+                job_text = build_job_description_text(job_to_profile_dict(job))
+                if is_stale(job, job_text):
+                    vector = refresh_job_embedding(db, job, job_text)
+                else:
+                    vector = np.frombuffer(job.embedding.vector, dtype=np.float32)
+                job_pool.upsert(job.id, vector)
+        finally:
+            db.close()
+
+        job_pool.loaded = True
+        print(f"💼 Job pool dimuat: {len(job_pool)} lowongan dalam {time.perf_counter() - start:.2f}s")
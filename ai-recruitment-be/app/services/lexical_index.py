@@ -0,0 +1,235 @@
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.experience import Experience
+from app.models.skill import Skill
+from app.models.user import User
+
+# penulisan skill yang berbeda tapi maksudnya sama
+SKILL_ALIASES = {
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def normalize_term(name: str) -> str:
+    """Normalisasi nama skill: huruf kecil, spasi tunggal, alias."""
+    term = " ".join((name or "").lower().split()).strip(" .,;:")
+    return SKILL_ALIASES.get(term, term)
+
+
+def tokenize(text: str) -> List[str]:
+    """Token kata dari teks bebas (judul / deskripsi pengalaman)."""
+    tokens = (t.rstrip(".") for t in _TOKEN_RE.findall((text or "").lower()))
+    return [SKILL_ALIASES.get(t, t) for t in tokens if t]
+
+
+def document_terms(skills: Iterable[str], experience_texts: Iterable[str]) -> Counter:
+    """
+    Term dokumen kandidat: nama skill utuh (termasuk multi-kata)
+    + token kata dari pengalaman kerja.
+    """
+    terms = Counter(normalize_term(s) for s in skills if s)
+    for text in experience_texts:
+        terms.update(tokenize(text))
+    terms.pop("", None)
+    return terms
+
+
+class LexicalIndex:
+    """
+    Inverted index BM25 di memori atas skill + pengalaman kandidat.
+    Diisi sekali dari database lalu di-update per kandidat
+    saat skill / pengalaman disimpan.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, int]] = {}  # term -> {candidate_id: tf}
+        self._docs: Dict[int, Counter] = {}
+        self._lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _remove(self, candidate_id: int) -> None:
+        terms = self._docs.pop(candidate_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(candidate_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(candidate_id)
+
+    def upsert(self, candidate_id: int, terms: Counter) -> None:
+        with self._lock:
+            self._remove(candidate_id)
+            self._docs[candidate_id] = terms
+            self._lengths[candidate_id] = sum(terms.values())
+            self._total_length += self._lengths[candidate_id]
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[candidate_id] = tf
+
+    def remove(self, candidate_id: int) -> None:
+        with self._lock:
+            self._remove(candidate_id)
+
+    def scores(self, job_skills: Sequence[str], candidate_ids: Sequence[int]) -> np.ndarray:
+        """
+        Skor BM25 tiap kandidat (urutan = candidate_ids) untuk query
+        berupa daftar skill wajib job. Kandidat yang belum ter-index
+        mendapat skor 0.
+        """
+        out = np.zeros(len(candidate_ids), dtype=np.float32)
+        terms = {normalize_term(s) for s in job_skills if s}
+        terms.discard("")
+        if not terms or not candidate_ids:
+            return out
+
+        position = {cid: i for i, cid in enumerate(candidate_ids)}
+
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs:
+                return out
+            avg_length = self._total_length / n_docs or 1.0
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+                # iterasi sisi yang lebih kecil: postings atau kandidat
+                if len(postings) <= len(position):
+                    pairs = ((cid, tf) for cid, tf in postings.items() if cid in position)
+                else:
+                    pairs = ((cid, postings[cid]) for cid in position if cid in postings)
+
+                for cid, tf in pairs:
+                    norm = 1 - self.b + self.b * self._lengths[cid] / avg_length
+                    out[position[cid]] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        return out
+
+    def prefilter(
+        self,
+        job_skills: Sequence[str],
+        candidate_ids: Sequence[int],
+        keep: int,
+    ) -> List[int]:
+        """
+        Ambil `keep` kandidat dengan skor BM25 tertinggi. Kandidat tanpa
+        skill yang cocok hanya ikut jika slot masih tersisa.
+        """
+        if len(candidate_ids) <= keep:
+            return list(candidate_ids)
+
+        scores = self.scores(job_skills, candidate_ids)
+        idx = np.argpartition(-scores, keep - 1)[:keep]
+        return [candidate_ids[i] for i in sorted(idx)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "candidates": len(self._docs),
+                "terms": len(self._postings),
+            }
+
+
+lexical_index = LexicalIndex()
+_load_lock = threading.Lock()
+
+
+def _candidate_terms(db: Session, candidate_ids: Optional[List[int]] = None) -> Dict[int, Counter]:
+    """Ambil skill + pengalaman kandidat (kolom saja, tanpa ORM penuh)."""
+    skills = db.query(Skill.user_id, Skill.name).join(User, User.id == Skill.user_id)
+    experiences = db.query(
+        Experience.user_id,
+        Experience.job_title,
+        Experience.description,
+    ).join(User, User.id == Experience.user_id)
+
+    skills = skills.filter(User.role == "candidate")
+    experiences = experiences.filter(User.role == "candidate")
+    if candidate_ids is not None:
+        skills = skills.filter(Skill.user_id.in_(candidate_ids))
+        experiences = experiences.filter(Experience.user_id.in_(candidate_ids))
+
+    skill_names: Dict[int, List[str]] = {}
+    for user_id, name in skills:
+        skill_names.setdefault(user_id, []).append(name)
+
+    experience_texts: Dict[int, List[str]] = {}
+    for user_id, title, description in experiences:
+        experience_texts.setdefault(user_id, []).extend([title or "", description or ""])
+
+    return {
+        user_id: document_terms(skill_names.get(user_id, []), experience_texts.get(user_id, []))
+        for user_id in set(skill_names) | set(experience_texts)
+    }
+
+
+def load_lexical_index() -> None:
+    """Isi inverted index dari database (sekali, session sendiri)."""
+    with _load_lock:
+        if lexical_index.loaded:
+            return
+
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            for candidate_id, terms in _candidate_terms(db).items():
+                lexical_index.upsert(candidate_id, terms)
+        finally:
+            db.close()
+
+        lexical_index.loaded = True
+        print(
+            f"🔤 Lexical index dimuat: {len(lexical_index)} kandidat "
+            f"dalam {time.perf_counter() - start:.2f}s"
+        )
+
+
+def refresh_lexical(db: Session, candidate_id: int) -> None:
+    """
+    Update satu kandidat di inverted index (incremental).
+    Jika index belum dimuat, kandidat akan ikut saat load pertama.
+    """
+    with _load_lock:
+        if not lexical_index.loaded:
+            return
+
+        terms = _candidate_terms(db, [candidate_id]).get(candidate_id)
+        if terms:
+            lexical_index.upsert(candidate_id, terms)
+        else:
+            lexical_index.remove(candidate_id)
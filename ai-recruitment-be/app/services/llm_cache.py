@@ -0,0 +1,65 @@
+import hashlib
+import json
+from typing import Dict, List
+
+from app.core.cache_store import SqliteCacheStore
+from app.core.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ITEMS,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SECONDS,
+)
+
+# field verdict yang disimpan; id & nama selalu diambil dari data terbaru
+VERDICT_FIELDS = ("skor", "analisis_singkat", "rekomendasi")
+
+llm_store = SqliteCacheStore(
+    LLM_CACHE_PATH,
+    table="llm_verdicts",
+    max_items=LLM_CACHE_MAX_ITEMS,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def verdict_key(job_text: str, profile_text: str, system_prompt: str, model: str) -> str:
+    """
+    Key = hash(job, profil, system prompt, model). Mengubah prompt
+    atau model otomatis membuat semua verdict lama tidak terpakai.
+    """
+    parts = [_sha256(job_text), _sha256(profile_text), _sha256(system_prompt), model]
+    return _sha256("\n".join(parts))
+
+
+def job_fingerprint(job_text: str, system_prompt: str, model: str) -> str:
+    """Fingerprint sisi job untuk AIScreeningResult (ikut berubah jika prompt/model berubah)."""
+    return _sha256("\n".join([_sha256(job_text), _sha256(system_prompt), model]))
+
+
+def profile_fingerprint(profile_text: str) -> str:
+    """Fingerprint teks profil kandidat untuk AIScreeningResult."""
+    return _sha256(profile_text)
+
+
+def get_verdicts(keys: List[str]) -> Dict[str, dict]:
+    if not LLM_CACHE_ENABLED:
+        return {}
+    return {
+        key: json.loads(value)
+        for key, value in llm_store.get_many(keys).items()
+    }
+
+
+def put_verdicts(verdicts: Dict[str, dict]) -> None:
+    if not LLM_CACHE_ENABLED or not verdicts:
+        return
+    llm_store.put_many({
+        key: json.dumps(
+            {field: verdict.get(field) for field in VERDICT_FIELDS},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        for key, verdict in verdicts.items()
+    })
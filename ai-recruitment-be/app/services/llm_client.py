@@ -0,0 +1,204 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import (
+    LLM_MAX_RETRIES,
+    LLM_MODEL,
+    LLM_POOL_MAX_CONNECTIONS,
+    LLM_POOL_MAX_KEEPALIVE,
+    LLM_TIMEOUT_SECONDS,
+    OPENAI_BASE_URL,
+)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+
+class LLMClient:
+    """
+    Client LLM tunggal per proses: satu ChatOpenAI dengan pool koneksi
+    keep-alive (httpx) untuk sync dan async. Client async hidup di event
+    loop thread sendiri, sehingga koneksinya tetap dipakai ulang lintas
+    request (asyncio.run per request akan menutup loop & koneksinya).
+    """
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        base_url: Optional[str] = OPENAI_BASE_URL,
+        max_connections: int = LLM_POOL_MAX_CONNECTIONS,
+        max_keepalive: int = LLM_POOL_MAX_KEEPALIVE,
+        timeout: float = LLM_TIMEOUT_SECONDS,
+    ):
+        self.model = model
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._chat = None
+        self._sync_client = None
+        self._async_client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.saturated_calls = 0  # panggilan yang mulai saat pool penuh
+
+    # =========================
+    # LIFECYCLE
+    # =========================
+    def _start_loop(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="llm-client-loop",
+            daemon=True,
+        )
+        self._loop_thread.start()
+
+    def chat(self):
+        """ChatOpenAI bersama (dibuat sekali, lazy)."""
+        with self._lock:
+            if self._chat is None:
+                # import LangChain/OpenAI ditunda agar tidak membebani startup API
+                import httpx
+                from langchain_openai import ChatOpenAI
+
+                limits = httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                )
+                timeout = httpx.Timeout(self.timeout, connect=10.0)
+
+                self._start_loop()
+                self._sync_client = httpx.Client(limits=limits, timeout=timeout)
+                self._async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+
+                self._chat = ChatOpenAI(
+                    model=self.model,
+                    temperature=0,
+                    openai_api_key=OPENAI_API_KEY,
+                    base_url=self.base_url,
+                    max_retries=LLM_MAX_RETRIES,
+                    http_client=self._sync_client,
+                    http_async_client=self._async_client,
+                    model_kwargs={"response_format": {"type": "json_object"}},
+                )
+                print(f"🔌 LLM client siap: {self.model} @ {self.base_url or 'api.openai.com'}")
+            return self._chat
+
+    def close(self) -> None:
+        with self._lock:
+            if self._chat is None:
+                return
+            asyncio.run_coroutine_threadsafe(
+                self._async_client.aclose(), self._loop
+            ).result(timeout=5)
+            self._sync_client.close()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._chat = None
+
+    # =========================
+    # METRICS
+    # =========================
+    def _begin(self) -> float:
+        with self._metrics_lock:
+            if self.in_flight >= self.max_connections:
+                self.saturated_calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return time.perf_counter()
+
+    def _end(self, start: float, response=None) -> None:
+        elapsed = time.perf_counter() - start
+        usage = (getattr(response, "usage_metadata", None) or {}) if response is not None else {}
+        with self._metrics_lock:
+            self.in_flight -= 1
+            self.calls += 1
+            if response is None:
+                self.errors += 1
+            self._latencies.append(elapsed)
+            self.prompt_tokens += usage.get("input_tokens", 0)
+            self.completion_tokens += usage.get("output_tokens", 0)
+
+    # =========================
+    # CALLS
+    # =========================
+    def invoke(self, messages):
+        """Panggilan sync (blocking) lewat pool koneksi sync."""
+        chat = self.chat()
+        start = self._begin()
+        response = None
+        try:
+            response = chat.invoke(messages)
+            return response
+        finally:
+            self._end(start, response)
+
+    async def _ainvoke(self, messages):
+        chat = self.chat()
+        start = self._begin()
+        response = None
+        try:
+            response = await chat.ainvoke(messages)
+            return response
+        finally:
+            self._end(start, response)
+
+    async def ainvoke(self, messages):
+        """
+        Panggilan async dari event loop mana pun; request dijalankan
+        di loop milik client agar pool koneksi async tetap terpakai.
+        """
+        self.chat()
+        if asyncio.get_running_loop() is self._loop:
+            return await self._ainvoke(messages)
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._ainvoke(messages), self._loop)
+        )
+
+    def submit(self, coro):
+        """Jadwalkan coroutine di loop client; return concurrent.futures.Future."""
+        self.chat()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro):
+        """Jalankan coroutine di loop client dari kode sync, tunggu hasilnya."""
+        return self.submit(coro).result()
+
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            latencies = np.array(self._latencies) if self._latencies else None
+            return {
+                "model": self.model,
+                "base_url": self.base_url,
+                "connected": self._chat is not None,
+                "calls": self.calls,
+                "errors": self.errors,
+                "latency_p50_s": round(float(np.percentile(latencies, 50)), 3) if latencies is not None else None,
+                "latency_p95_s": round(float(np.percentile(latencies, 95)), 3) if latencies is not None else None,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "pool_max_connections": self.max_connections,
+                "pool_saturation": round(self.peak_in_flight / self.max_connections, 2),
+                "saturated_calls": self.saturated_calls,
+            }
+
+
+llm_client = LLMClient()
@@ -1,9 +1,7 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
 from app.models.job_posting import JobPosting
-
-model = SentenceTransformer("intfloat/multilingual-e5-small")
+from app.models.user import User
 
 def build_job_description_text(job_description: dict) -> str:
     """
@@ -48,6 +46,37 @@ def build_job_description_text(job_description: dict) -> str:
 
     return text
 
+def _experience_line(exp: dict) -> str:
+    exp_text = f"- {exp.get('jobTitle')}"
+    if exp.get("companyName"):
+        exp_text += f" di {exp.get('companyName')}"
+    if exp.get("description"):
+        exp_text += f" ({exp.get('description')})"
+    return exp_text
+
+
+def _education_line(edu: dict) -> str:
+    edu_text = f"- {edu.get('degree')}"
+    if edu.get("fieldOfStudy"):
+        edu_text += f" {edu.get('fieldOfStudy')}"
+    if edu.get("institution"):
+        edu_text += f" dari {edu.get('institution')}"
+    return edu_text
+
+
+def _role_block(candidate: dict) -> str:
+    """
+    Baris posisi yang dilamar; dihilangkan jika tidak ada (profil tanpa
+    posisi dipakai bersama semua job) agar LLM tidak membaca
+    "Tidak disebutkan" sebagai role yang kosong.
+    """
+    position = candidate.get("positionApplied")
+    if not position:
+        return ""
+    return f"""
+        Posisi / Role:
+        {position}"""
+
 def build_candidate_text(candidate: dict) -> str:
     """
     Mengubah data kandidat menjadi teks profil kandidat
@@ -64,14 +93,9 @@ def build_candidate_text(candidate: dict) -> str:
     skills_text = ", ".join(skills_list) if skills_list else "Tidak disebutkan"
 
     # ===== Work Experience =====
-    experience_blocks = []
-    for exp in candidate.get("workExperience", []):
-        exp_text = f"- {exp.get('jobTitle')}"
-        if exp.get("companyName"):
-            exp_text += f" di {exp.get('companyName')}"
-        if exp.get("description"):
-            exp_text += f" ({exp.get('description')})"
-        experience_blocks.append(exp_text)
+    experience_blocks = [
+        _experience_line(exp) for exp in candidate.get("workExperience", [])
+    ]
 
     experience_text = (
         "\n".join(experience_blocks)
@@ -80,14 +104,9 @@ def build_candidate_text(candidate: dict) -> str:
     )
 
     # ===== Education =====
-    education_blocks = []
-    for edu in candidate.get("education", []):
-        edu_text = f"- {edu.get('degree')}"
-        if edu.get("fieldOfStudy"):
-            edu_text += f" {edu.get('fieldOfStudy')}"
-        if edu.get("institution"):
-            edu_text += f" dari {edu.get('institution')}"
-        education_blocks.append(edu_text)
+    education_blocks = [
+        _education_line(edu) for edu in candidate.get("education", [])
+    ]
 
     education_text = (
         "\n".join(education_blocks)
@@ -111,9 +130,7 @@ def build_candidate_text(candidate: dict) -> str:
     text = f"""
         PROFIL KANDIDAT
         Nama:
-        {user.get("name")}
-        Posisi / Role:
-        {candidate.get("positionApplied", "Tidak disebutkan")}
+        {user.get("name")}{_role_block(candidate)}
         Lokasi:
         {user.get("location", "Tidak disebutkan")}
         KEAHLIAN UTAMA:
@@ -130,6 +147,92 @@ def build_candidate_text(candidate: dict) -> str:
 
     return text
 
+def build_candidate_sections(candidate: dict) -> List[str]:
+    """
+    Memecah profil kandidat menjadi section pendek (identitas + skill,
+    tiap pengalaman kerja, pendidikan, sertifikasi) agar tidak ada
+    bagian yang terpotong max_seq_length model saat di-embed.
+    """
+
+    user = candidate.get("user", {})
+
+    skills_list = [f"{s.get('name')}" for s in candidate.get("skills", [])]
+    skills_text = ", ".join(skills_list) if skills_list else "Tidak disebutkan"
+
+    sections = [
+        f"""
+        PROFIL KANDIDAT
+        Nama:
+        {user.get("name")}{_role_block(candidate)}
+        Lokasi:
+        {user.get("location", "Tidak disebutkan")}
+        KEAHLIAN UTAMA:
+        {skills_text}
+        """.strip()
+    ]
+
+    # satu section per pengalaman: entri lama tidak lagi jatuh di ujung teks
+    for exp in candidate.get("workExperience", []):
+        sections.append(f"PENGALAMAN KERJA:\n{_experience_line(exp)}")
+
+    education_blocks = [
+        _education_line(edu) for edu in candidate.get("education", [])
+    ]
+    if education_blocks:
+        sections.append("PENDIDIKAN:\n" + "\n".join(education_blocks))
+
+    certifications = candidate.get("certifications", [])
+    if certifications:
+        sections.append("SERTIFIKASI:\n" + ", ".join(certifications))
+
+    return sections
+
+def build_candidate_dict(user: User, position_applied: Optional[str] = None) -> dict:
+    """
+    Mengubah ORM User (+ skills, experiences, educations, salary, documents)
+    menjadi candidate dict yang dipakai build_candidate_text.
+    """
+
+    candidate = {
+        "id": user.id,
+        "user": {
+            "name": user.full_name,
+            "email": user.email,
+            "location": user.location,
+        },
+        "skills": [{"name": s.name, "level": s.level} for s in user.skills],
+        "workExperience": [
+            {
+                "jobTitle": e.job_title,
+                "companyName": e.company_name,
+                "description": e.description,
+            }
+            for e in user.experiences
+        ],
+        "education": [
+            {
+                "degree": edu.degree,
+                "fieldOfStudy": edu.field_of_study,
+                "institution": edu.institution,
+            }
+            for edu in user.educations
+        ],
+        "salaryExpectation": {
+            "min": user.salary.min_salary if user.salary else 0,
+            "max": user.salary.max_salary if user.salary else 0,
+        },
+        "certifications": [
+            d.file_name
+            for d in user.documents
+            if d.type == "certificate"
+        ],
+    }
+
+    if position_applied is not None:
+        candidate["positionApplied"] = position_applied
+
+    return candidate
+
 def build_job_profile_dict(db: Session, job_id: int) -> dict:
     """
     Mengambil JobPosting dari database dan
@@ -149,6 +252,15 @@ def build_job_profile_dict(db: Session, job_id: int) -> dict:
     if not job:
         raise ValueError(f"JobPosting dengan id={job_id} tidak ditemukan")
 
+    return job_to_profile_dict(job)
+
+
+def job_to_profile_dict(job: JobPosting) -> dict:
+    """
+    Mengubah ORM JobPosting (+ skills & certifications)
+    menjadi job profile dict terstruktur untuk AI.
+    """
+
     return {
         "id": job.id,
         "title": job.title,
@@ -177,46 +289,83 @@ def build_job_profile_dict(db: Session, job_id: int) -> dict:
     }
 
 
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict
 
-# Load model sekali saja (global)
-model = SentenceTransformer("intfloat/multilingual-e5-small")
+from typing import List, Dict, Optional
+import numpy as np
+
+from app.core.config import EMBEDDING_BATCH_SIZE, HYBRID_LEXICAL_WEIGHT
+from app.services.lexical_index import lexical_index, load_lexical_index
+from app.services.profile_embedding import embed_profiles
+from app.services.model_registry import get_model, model_key
+from app.services.vector_index import top_k_indices
 
 
 def match_candidates(
     job_text: str,
     candidates: List[Dict],
+    top_k: Optional[int] = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    job_embedding: Optional[np.ndarray] = None,
+    job_skills: Optional[List[str]] = None,
+    lexical_weight: float = HYBRID_LEXICAL_WEIGHT,
+    candidate_embeddings: Optional[np.ndarray] = None,
 ) -> List[Dict]:
-    # Encode job sekali saja
-    job_embedding = model.encode(
-        job_text,
-        normalize_embeddings=True
-    )
-
-    results = []
+    """
+    Ranking kandidat berdasarkan kemiripan semantik dengan job.
+    Embedding kandidat diambil dari cache, sisanya di-encode per
+    mini-batch, lalu semua diskor sekaligus dengan satu dot product
+    (embedding sudah ternormalisasi).
+    Jika job_skills diberikan, skor BM25 skill/pengalaman ikut
+    digabung (hybrid) agar skill yang persis sama tidak kabur.
+    candidate_embeddings: vektor profil yang sudah dihitung (urutan sama
+    dengan candidates), mis. satu pass embedding untuk banyak job.
+    """
+    if not candidates:
+        return []
+
+    # Vektor job biasanya sudah tersimpan (lihat job_embedding.py),
+    # encode di sini hanya sebagai fallback
+    if job_embedding is None:
+        job_embedding = get_model().encode(
+            job_text,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
 
-    for c in candidates:
-        candidate_embedding = model.encode(
-            c["text"],
-            normalize_embeddings=True
+    # hanya kandidat yang profilnya berubah (cache miss) yang di-encode;
+    # profil panjang di-embed per section (lihat profile_embedding.py)
+    if candidate_embeddings is None:
+        candidate_embeddings = embed_profiles(
+            get_model(),
+            [c["text"] for c in candidates],
+            [c.get("sections") for c in candidates],
+            model_name=model_key(),
+            batch_size=batch_size,
         )
 
-        similarity = cosine_similarity(
-            [job_embedding],
-            [candidate_embedding]
-        )[0][0]
+    # cosine similarity = dot product untuk vektor ternormalisasi
+    semantic = candidate_embeddings @ job_embedding
+
+    # skor BM25 dinormalisasi ke [0, 1] relatif terhadap kandidat terbaik
+    lexical = np.zeros(len(candidates), dtype=np.float32)
+    if job_skills and lexical_weight > 0:
+        load_lexical_index()
+        lexical = lexical_index.scores(job_skills, [c["id"] for c in candidates])
+        if lexical.max() > 0:
+            lexical = lexical / lexical.max()
 
+    scores = (1 - lexical_weight) * semantic + lexical_weight * lexical if job_skills else semantic
+
+    results = []
+    for i in top_k_indices(scores, top_k):
+        c = candidates[i]
         results.append({
             "id": c["id"],
             "name": c.get("name"),
-            "semantic_score": round(similarity * 100, 2),
+            "semantic_score": round(float(semantic[i]) * 100, 2),
+            "lexical_score": round(float(lexical[i]) * 100, 2),
+            "match_score": round(float(scores[i]) * 100, 2),
             "text": c["text"],  # optional, untuk debug / LLM
         })
 
-    return sorted(
-        results,
-        key=lambda x: x["semantic_score"],
-        reverse=True
-    )
+    return results
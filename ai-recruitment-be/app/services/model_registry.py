@@ -0,0 +1,156 @@
+import os
+import resource
+import threading
+import time
+from typing import Dict
+
+from app.core.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_DEVICE,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_ONNX_EXPORT_DIR,
+    EMBEDDING_ONNX_FILE,
+    EMBEDDING_ONNX_QUANTIZATION,
+)
+
+BACKENDS = ("torch", "torch-int8", "onnx-int8")
+
+# Satu instance per model untuk seluruh proses
+_models: Dict[str, object] = {}
+_stats: Dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _rss_mb() -> float:
+    """
+    RSS proses saat ini (MB). Fallback ke peak RSS jika /proc tidak ada.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _param_mb(model) -> float:
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters()) / 1024 ** 2
+    except AttributeError:
+        return 0.0
+
+
+def model_key(name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> str:
+    """
+    Identitas vektor yang dihasilkan model: nama + backend.
+    Dipakai sebagai bagian key cache, karena vektor int8 != vektor fp32.
+    """
+    return name if backend == "torch" else f"{name}@{backend}"
+
+
+def _load_onnx_int8(name: str):
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    try:
+        return SentenceTransformer(
+            name,
+            device="cpu",
+            backend="onnx",
+            model_kwargs={"file_name": EMBEDDING_ONNX_FILE},
+        )
+    except Exception as e:
+        print(f"⚠️ {EMBEDDING_ONNX_FILE} tidak tersedia untuk {name} ({e}), kuantisasi lokal")
+
+    # export ONNX fp32 lalu kuantisasi dinamis int8, sekali saja per mesin
+    local_dir = os.path.join(EMBEDDING_ONNX_EXPORT_DIR, name.replace("/", "__"))
+    file_name = f"onnx/model_qint8_{EMBEDDING_ONNX_QUANTIZATION}.onnx"
+    if not os.path.exists(os.path.join(local_dir, file_name)):
+        model = SentenceTransformer(name, device="cpu", backend="onnx")
+        model.save(local_dir)
+        export_dynamic_quantized_onnx_model(model, EMBEDDING_ONNX_QUANTIZATION, local_dir)
+
+    return SentenceTransformer(
+        local_dir,
+        device="cpu",
+        backend="onnx",
+        model_kwargs={"file_name": file_name},
+    )
+
+
+def _load(name: str, backend: str):
+    # import berat (torch / onnxruntime) hanya terjadi di sini
+    if backend == "onnx-int8":
+        return _load_onnx_int8(name)
+
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(name, device=EMBEDDING_DEVICE)
+    if backend == "torch-int8":
+        import torch
+
+        model = torch.ao.quantization.quantize_dynamic(
+            model,
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
+    return model
+
+
+def get_model(name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND):
+    """
+    Ambil SentenceTransformer dari registry.
+    Model di-load sekali saat pertama kali dipakai (thread-safe).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"EMBEDDING_BACKEND tidak dikenal: {backend} (pilihan: {', '.join(BACKENDS)})")
+
+    key = model_key(name, backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is not None:
+            return model
+
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+
+        model = _load(name, backend)
+
+        load_seconds = time.perf_counter() - start
+        rss_delta = _rss_mb() - rss_before
+
+        _stats[key] = {
+            "backend": backend,
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_mb": round(rss_delta, 1),
+            "param_mb": round(_param_mb(model), 1),
+            "loaded_at": time.time(),
+        }
+        _models[key] = model
+
+        print(f"🧠 Model {key} dimuat dalam {load_seconds:.2f}s (+{rss_delta:.0f} MB RSS)")
+
+    return model
+
+
+def is_loaded(name: str = EMBEDDING_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> bool:
+    return model_key(name, backend) in _models
+
+
+def model_stats() -> dict:
+    return {
+        "rss_mb": round(_rss_mb(), 1),
+        "models": {name: dict(stats) for name, stats in _stats.items()},
+    }
+
+
+def warm_up(name: str = EMBEDDING_MODEL_NAME) -> None:
+    """
+    Load model + satu forward pass kecil agar request pertama tidak lambat.
+    """
+    start = time.perf_counter()
+    get_model(name).encode(["warm up"], normalize_embeddings=True)
+    print(f"🔥 Warm-up {name} selesai dalam {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,163 @@
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.models.application import Application
+from app.models.education import Education
+from app.models.experience import Experience
+from app.models.job_posting import JobPosting
+from app.models.salary_expectation import SalaryExpectation
+from app.models.user import User
+
+# urutan jenjang sama dengan enum JobPosting.min_education
+EDUCATION_LEVELS = list(JobPosting.__table__.c.min_education.type.enums)
+
+# gelar / jenjang bebas di Education.degree -> index EDUCATION_LEVELS
+_DEGREE_PATTERNS = [
+    (4, re.compile(r"\b(s3|doktor|doctor|ph\.?\s?d|dr)\b")),
+    # "MA" = Master of Arts, kecuali ditulis "MA/SMA" (Madrasah Aliyah)
+    (3, re.compile(r"\b(s2|magister|master|mba|m\.\s?[a-z]+)|(?<![/.])(?<!/\s)\bma\b(?!\s*/)")),
+    (2, re.compile(r"\b(s1|sarjana|bachelor|s\.\s?[a-z]+)")),
+    (1, re.compile(r"\b(d[1-4]|diploma|a\.?\s?md)\b")),
+    (0, re.compile(r"\b(sma|smk|ma|slta|high school|madrasah aliyah)\b")),
+]
+
+
+def education_rank(degree: Optional[str]) -> int:
+    """Jenjang pendidikan dari teks gelar; -1 jika tidak dikenali."""
+    text = (degree or "").lower()
+    for rank, pattern in _DEGREE_PATTERNS:
+        if pattern.search(text):
+            return rank
+    return -1
+
+
+def experience_years(db: Session, candidate_ids: List[int]) -> np.ndarray:
+    """
+    Total tahun pengalaman per kandidat (urutan = candidate_ids),
+    dijumlah dari Experience.start_date/end_date (end kosong = sekarang).
+    NaN jika kandidat tidak punya data pengalaman atau punya pengalaman
+    tanpa start_date (total tidak diketahui).
+    """
+    position = {cid: i for i, cid in enumerate(candidate_ids)}
+    rows = (
+        db.query(Experience.user_id, Experience.start_date, Experience.end_date)
+        .filter(Experience.user_id.in_(candidate_ids))
+        .all()
+    )
+    years = np.zeros(len(candidate_ids), dtype=np.float32)
+
+    dated = [r for r in rows if r[1] is not None]
+    if dated:
+        owners = np.array([position[r[0]] for r in dated])
+        today = date.today()
+        start = np.array([r[1] for r in dated], dtype="datetime64[D]")
+        end = np.array([r[2] or today for r in dated], dtype="datetime64[D]")
+
+        days = np.clip((end - start).astype(np.int64), 0, None)
+        years = (np.bincount(owners, weights=days, minlength=len(candidate_ids)) / 365.25).astype(np.float32)
+
+    undated = [position[r[0]] for r in rows if r[1] is None]
+    years[undated] = np.nan
+
+    # belum mengisi pengalaman sama sekali = tidak diketahui, bukan 0 tahun
+    filled = np.zeros(len(candidate_ids), dtype=bool)
+    filled[[position[r[0]] for r in rows]] = True
+    years[~filled] = np.nan
+    return years
+
+
+def education_ranks(db: Session, candidate_ids: List[int]) -> np.ndarray:
+    """Jenjang tertinggi per kandidat; -1 jika tidak ada / tidak dikenali."""
+    position = {cid: i for i, cid in enumerate(candidate_ids)}
+    ranks = np.full(len(candidate_ids), -1, dtype=np.int8)
+
+    rows = (
+        db.query(Education.user_id, Education.degree)
+        .filter(Education.user_id.in_(candidate_ids))
+        .all()
+    )
+    if rows:
+        owners = np.array([position[r[0]] for r in rows])
+        values = np.array([education_rank(r[1]) for r in rows], dtype=np.int8)
+        np.maximum.at(ranks, owners, values)
+    return ranks
+
+
+def prefilter_applicants(
+    db: Session,
+    job_profile: dict,
+    max_salary: Optional[int] = None,
+    location: Optional[str] = None,
+) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Saring pelamar yang pasti tidak memenuhi syarat wajib sebelum
+    profil lengkap dimuat dan di-embed.
+    Gaji & lokasi disaring di SQL; pengalaman & pendidikan dicek
+    vektor numpy. Data yang kosong / tidak dikenali tidak dibuang.
+    Return (user_id yang lolos, jumlah kandidat yang dibuang per aturan).
+    """
+    requirements = job_profile["requirements"]
+    removed: Dict[str, int] = {}
+
+    query = (
+        db.query(Application.user_id)
+        .join(User, User.id == Application.user_id)
+        .filter(Application.job_id == job_profile["id"])
+    )
+    total = query.count()
+
+    # ===== SQL: ekspektasi gaji minimal di atas plafon =====
+    if max_salary is not None:
+        query = query.outerjoin(
+            SalaryExpectation, SalaryExpectation.user_id == Application.user_id
+        ).filter(
+            or_(
+                SalaryExpectation.min_salary.is_(None),
+                SalaryExpectation.min_salary <= max_salary,
+            )
+        )
+        count = query.count()
+        removed["salary"] = total - count
+        total = count
+
+    # ===== SQL: lokasi =====
+    if location:
+        query = query.filter(
+            or_(
+                User.location.is_(None),
+                func.lower(User.location).contains(location.lower(), autoescape=True),
+            )
+        )
+        count = query.count()
+        removed["location"] = total - count
+        total = count
+
+    candidate_ids = [user_id for (user_id,) in query.all()]
+    if not candidate_ids:
+        return candidate_ids, removed
+
+    ids = np.array(candidate_ids)
+    keep = np.ones(len(ids), dtype=bool)
+
+    # ===== Vektor: total tahun pengalaman =====
+    min_years = requirements.get("min_experience_years") or 0
+    if min_years > 0:
+        years = experience_years(db, candidate_ids)
+        passed = np.isnan(years) | (years >= min_years)
+        removed["experience"] = int((keep & ~passed).sum())
+        keep &= passed
+
+    # ===== Vektor: jenjang pendidikan =====
+    min_education = requirements.get("min_education")
+    if min_education in EDUCATION_LEVELS:
+        ranks = education_ranks(db, candidate_ids)
+        passed = (ranks < 0) | (ranks >= EDUCATION_LEVELS.index(min_education))
+        removed["education"] = int((keep & ~passed).sum())
+        keep &= passed
+
+    return ids[keep].tolist(), removed
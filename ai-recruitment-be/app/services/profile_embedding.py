@@ -0,0 +1,130 @@
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_ENABLED,
+    PROFILE_SECTION_POOLING,
+)
+from app.services.batching import token_lengths
+from app.services.embedding_cache import embedding_key, embedding_store, encode_texts
+
+
+def pool_sections(vectors: np.ndarray, owners: np.ndarray, n: int) -> np.ndarray:
+    """
+    Mean-pooling vektor section per profil (owners = index profil
+    pemilik tiap section), lalu dinormalisasi ulang.
+    """
+    pooled = np.zeros((n, vectors.shape[1]), dtype=np.float32)
+    np.add.at(pooled, owners, vectors)
+
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return pooled / norms
+
+
+def _compute_profiles(
+    model,
+    texts: List[str],
+    sections: List[Optional[List[str]]],
+    model_name: str,
+    mode: str,
+    batch_size: int,
+) -> np.ndarray:
+    # "auto": hanya profil yang terpotong (panjang token == max_seq_length)
+    if mode == "auto":
+        max_length = getattr(model, "max_seq_length", None) or 512
+        truncated = token_lengths(model, texts) >= max_length
+    else:
+        truncated = np.ones(len(texts), dtype=bool)
+
+    pooled_idx = [i for i in range(len(texts)) if sections[i] and truncated[i]]
+    whole_idx = sorted(set(range(len(texts))) - set(pooled_idx))
+
+    dim = model.get_sentence_embedding_dimension()
+    out = np.empty((len(texts), dim), dtype=np.float32)
+
+    if whole_idx:
+        out[whole_idx] = encode_texts(
+            model,
+            [texts[i] for i in whole_idx],
+            model_name=model_name,
+            batch_size=batch_size,
+        )
+
+    if pooled_idx:
+        # semua section dari semua profil panjang di-encode dalam satu
+        # pass; section yang tidak berubah diambil dari cache embedding
+        flat, owners = [], []
+        for slot, i in enumerate(pooled_idx):
+            flat.extend(sections[i])
+            owners.extend([slot] * len(sections[i]))
+
+        section_vectors = encode_texts(
+            model, flat, model_name=model_name, batch_size=batch_size
+        )
+        out[pooled_idx] = pool_sections(
+            section_vectors, np.array(owners), len(pooled_idx)
+        )
+        print(
+            f"🧩 Section pooling: {len(pooled_idx)} profil panjang, "
+            f"{len(flat)} section"
+        )
+
+    return out
+
+
+def embed_profiles(
+    model,
+    texts: List[str],
+    sections: List[Optional[List[str]]],
+    model_name: str,
+    mode: str = PROFILE_SECTION_POOLING,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    Embedding profil kandidat (n, dim) float32 ternormalisasi.
+    Profil pendek di-embed utuh; profil yang melebihi max_seq_length
+    di-embed per section lalu di-pool. Vektor akhir profil ikut di-cache
+    agar request berikutnya tidak perlu tokenisasi ulang.
+    """
+    if mode == "off" or not any(sections):
+        return encode_texts(model, texts, model_name=model_name, batch_size=batch_size)
+
+    if not EMBEDDING_CACHE_ENABLED:
+        return _compute_profiles(model, texts, sections, model_name, mode, batch_size)
+
+    # mode ikut masuk key: ganti mode tidak memakai vektor lama
+    profile_model = f"{model_name}#profile-{mode}"
+    keys = [embedding_key(t, profile_model) for t in texts]
+    cached = embedding_store.get_many(keys)
+
+    out = np.empty(
+        (len(texts), model.get_sentence_embedding_dimension()),
+        dtype=np.float32,
+    )
+
+    missing = []
+    for i, key in enumerate(keys):
+        value = cached.get(key)
+        if value is None:
+            missing.append(i)
+        else:
+            out[i] = np.frombuffer(value, dtype=np.float32)
+
+    if missing:
+        computed = _compute_profiles(
+            model,
+            [texts[i] for i in missing],
+            [sections[i] for i in missing],
+            model_name,
+            mode,
+            batch_size,
+        )
+        out[missing] = computed
+        embedding_store.put_many({
+            keys[i]: vector.tobytes() for i, vector in zip(missing, computed)
+        })
+
+    return out
@@ -0,0 +1,208 @@
+import math
+import re
+from typing import Callable, Dict, List, Tuple
+
+from app.core.config import (
+    LLM_CHUNK_SIZE,
+    LLM_MODEL,
+    LLM_PROFILE_MAX_TOKENS,
+    LLM_PROMPT_TOKEN_BUDGET,
+)
+
+_encoder = None
+_encoder_failed = False
+
+
+def _get_encoder():
+    global _encoder, _encoder_failed
+    if _encoder is None and not _encoder_failed:
+        try:
+            import tiktoken
+
+            try:
+                _encoder = tiktoken.encoding_for_model(LLM_MODEL)
+            except KeyError:
+                _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # tiktoken tidak terpasang / file encoding tidak bisa diunduh
+            _encoder_failed = True
+            print(f"⚠️ Tokenizer LLM tidak tersedia ({e}), memakai estimasi ~4 karakter/token")
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    encoder = _get_encoder()
+    if encoder is None:
+        return math.ceil(len(text) / 4)
+    return len(encoder.encode(text))
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    encoder = _get_encoder()
+    if encoder is None:
+        return text[:max_tokens * 4]
+    return encoder.decode(encoder.encode(text)[:max_tokens])
+
+
+# =========================
+# TRIM PROFIL (bagian bernilai rendah dulu)
+# =========================
+_HEADER_RE = re.compile(r"^[A-Z][A-Z /]+:$")
+
+
+def _sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in lines:
+        if _HEADER_RE.match(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def _join(sections: List[Tuple[str, List[str]]]) -> str:
+    lines = []
+    for header, body in sections:
+        if header:
+            lines.append(header)
+        lines.extend(body)
+    return "\n".join(lines)
+
+
+def _shorten_descriptions(text: str, max_words: int) -> str:
+    def shorten(match):
+        words = match.group(1).split()
+        if len(words) <= max_words:
+            return match.group(0)
+        return f"({' '.join(words[:max_words])} ...)"
+
+    sections = _sections(text.splitlines())
+    return _join([
+        (header, [re.sub(r"\((.*)\)$", shorten, line) for line in body])
+        if header == "PENGALAMAN KERJA:" else (header, body)
+        for header, body in sections
+    ])
+
+
+def _limit_certifications(text: str, keep: int = 3) -> str:
+    sections = _sections(text.splitlines())
+    out = []
+    for header, body in sections:
+        if header == "SERTIFIKASI:" and body:
+            certs = body[0].split(", ")
+            if len(certs) > keep:
+                body = [", ".join(certs[:keep]) + f" (+{len(certs) - keep} lainnya)"] + body[1:]
+        out.append((header, body))
+    return _join(out)
+
+
+def _limit_experiences(text: str, keep: int = 3) -> str:
+    sections = _sections(text.splitlines())
+    out = []
+    for header, body in sections:
+        if header == "PENGALAMAN KERJA:" and len(body) > keep:
+            body = body[:keep] + [f"- (+{len(body) - keep} pengalaman lain)"]
+        out.append((header, body))
+    return _join(out)
+
+
+TRIM_STEPS: List[Tuple[str, Callable[[str], str]]] = [
+    ("deskripsi_pengalaman", lambda t: _shorten_descriptions(t, 25)),
+    ("sertifikasi", _limit_certifications),
+    ("pengalaman_lama", _limit_experiences),
+    ("deskripsi_pengalaman_min", lambda t: _shorten_descriptions(t, 8)),
+]
+
+
+def compact_profile(text: str) -> str:
+    """Buang indentasi & baris kosong dari teks profil (tanpa kehilangan isi)."""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def trim_profile(text: str, max_tokens: int) -> Tuple[str, List[str]]:
+    """
+    Pangkas profil sampai <= max_tokens: deskripsi pengalaman dipendekkan,
+    sertifikasi & pengalaman lama diringkas, terakhir dipotong paksa.
+    Return (teks, langkah yang dipakai).
+    """
+    text = compact_profile(text)
+    applied = []
+    for name, step in TRIM_STEPS:
+        if count_tokens(text) <= max_tokens:
+            return text, applied
+        text = step(text)
+        applied.append(name)
+
+    if count_tokens(text) > max_tokens:
+        text = _truncate_tokens(text, max_tokens)
+        applied.append("potong")
+    return text, applied
+
+
+# =========================
+# PACKING (first-fit decreasing)
+# =========================
+def pack_candidates(
+    candidates: List[Dict],
+    render: Callable[[Dict], str],
+    overhead_tokens: int,
+    token_budget: int = LLM_PROMPT_TOKEN_BUDGET,
+    max_profile_tokens: int = LLM_PROFILE_MAX_TOKENS,
+    max_per_call: int = LLM_CHUNK_SIZE,
+) -> Tuple[List[List[Dict]], Dict]:
+    """
+    Kelompokkan kandidat ke sesedikit mungkin panggilan LLM dengan
+    total token prompt (overhead + baris kandidat) <= token_budget
+    dan maksimal max_per_call kandidat per panggilan.
+    Return (bins kandidat dengan profile_text terpangkas, report).
+    """
+    capacity = token_budget - overhead_tokens
+    per_profile = max(min(max_profile_tokens, capacity), 1)
+
+    items = []
+    trimmed = {}
+    for c in candidates:
+        text, steps = trim_profile(c["profile_text"], per_profile)
+        item = {**c, "profile_text": text}
+        tokens = count_tokens(render(item))
+
+        # JSON escaping bisa membuat baris sedikit melebihi kapasitas
+        while tokens > capacity:
+            shorter = _truncate_tokens(text, max(count_tokens(text) - (tokens - capacity) - 1, 1))
+            if shorter == text:
+                break
+            text = shorter
+            item = {**c, "profile_text": text}
+            tokens = count_tokens(render(item))
+            if "potong" not in steps:
+                steps.append("potong")
+
+        if steps:
+            trimmed[str(c["id"])] = steps
+        items.append((tokens, item))
+
+    bins: List[List[Dict]] = []
+    bin_tokens: List[int] = []
+    for tokens, item in sorted(items, key=lambda x: x[0], reverse=True):
+        for i in range(len(bins)):
+            if bin_tokens[i] + tokens <= capacity and len(bins[i]) < max_per_call:
+                bins[i].append(item)
+                bin_tokens[i] += tokens
+                break
+        else:
+            bins.append([item])
+            bin_tokens.append(tokens)
+
+    total = sum(t for t, _ in items)
+    report = {
+        "calls": len(bins),
+        # batas bawah jumlah panggilan (token maupun jumlah kandidat)
+        "min_calls": max(
+            math.ceil(total / capacity) if capacity > 0 else len(items),
+            math.ceil(len(items) / max_per_call),
+        ) if items else 0,
+        "prompt_tokens": [overhead_tokens + t for t in bin_tokens],
+        "candidate_tokens": {str(item["id"]): t for t, item in items},
+        "trimmed": trimmed,
+    }
+    return bins, report
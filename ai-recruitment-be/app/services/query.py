@@ -274,53 +274,26 @@
 #         print(f"❌ LLM Error: {e}")
 #         return []
 
-import os
+import asyncio
 import json
-from typing import List, Dict
-
-from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage, SystemMessage
-from dotenv import load_dotenv
-
-load_dotenv()
-
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
-
-def to_compact_json(data: Dict) -> str:
-    """
-    Konversi dict ke JSON ringkas agar hemat token LLM.
-    """
-    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-
-
-def score_candidates_with_llm(
-    job_text: str,
-    candidates_data: List[Dict],
-) -> List[Dict]:
-    """
-    HR-grade LLM reasoning.
-    Membandingkan FULL JOB TEXT vs FULL CANDIDATE PROFILE TEXT.
-    """
-
-    if not candidates_data:
-        return []
-
-    print(f"🤖 [LLM] Menilai {len(candidates_data)} kandidat")
-
-    candidates_str = "\n".join(
-        f"- {to_compact_json(c)}"
-        for c in candidates_data
-    )
-
-    chat = ChatOpenAI(
-        model="gpt-4o",
-        temperature=0,
-        openai_api_key=OPENAI_API_KEY,
-        model_kwargs={"response_format": {"type": "json_object"}},
-    )
-
-    system_prompt = """
+import math
+import queue
+from typing import AsyncIterator, Dict, Iterator, List
+
+from app.core.config import (
+    LLM_CHUNK_RETRIES,
+    LLM_CHUNK_SIZE,
+    LLM_MAX_CONCURRENCY,
+    LLM_MODEL,
+)
+from app.services.llm_cache import get_verdicts, llm_store, put_verdicts, verdict_key
+from app.services.llm_client import llm_client
+from app.services.prompt_packing import count_tokens, pack_candidates
+
+# token pembungkus pesan chat (role, separator) per panggilan
+MESSAGE_OVERHEAD_TOKENS = 12
+
+SYSTEM_PROMPT = """
 Anda adalah Senior HR Specialist dan Talent Acquisition Manager.
 
 Tugas Anda adalah mengevaluasi kecocokan kandidat dengan lowongan kerja
@@ -351,7 +324,20 @@ OUTPUT WAJIB JSON VALID:
 }
 """
 
-    user_prompt = f"""
+
+def to_compact_json(data: Dict) -> str:
+    """
+    Konversi dict ke JSON ringkas agar hemat token LLM.
+    """
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def render_candidate(candidate: Dict) -> str:
+    return f"- {to_compact_json(candidate)}"
+
+
+def build_user_prompt(job_text: str, candidates_str: str) -> str:
+    return f"""
 LOWONGAN PEKERJAAN:
 {job_text}
 
@@ -359,15 +345,228 @@ KANDIDAT:
 {candidates_str}
 """
 
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=user_prompt),
+
+def prompt_overhead_tokens(job_text: str) -> int:
+    """Token tetap per panggilan: system prompt + job + kerangka pesan."""
+    return (
+        count_tokens(SYSTEM_PROMPT)
+        + count_tokens(build_user_prompt(job_text, ""))
+        + MESSAGE_OVERHEAD_TOKENS
+    )
+
+
+def build_messages(job_text: str, candidates_data: List[Dict]) -> list:
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    candidates_str = "\n".join(
+        render_candidate(c)
+        for c in candidates_data
+    )
+
+    return [
+        SystemMessage(content=SYSTEM_PROMPT),
+        HumanMessage(content=build_user_prompt(job_text, candidates_str)),
     ]
 
+
+def normalize_verdict(r: Dict) -> Dict:
+    """
+    Validasi satu verdict LLM: skor harus angka (dibatasi 0–100),
+    analisis_singkat & rekomendasi harus teks tidak kosong.
+    ValueError jika tidak valid.
+    """
+    skor = r.get("skor")
+    if isinstance(skor, bool):
+        raise ValueError(f"skor tidak valid untuk id {r.get('id')}: {skor!r}")
     try:
-        response = chat.invoke(messages)
-        parsed = json.loads(response.content)
-        return parsed.get("results", [])
-    except Exception as e:
-        print(f"❌ LLM Error: {e}")
-        return []
+        skor = float(skor)
+    except (TypeError, ValueError):
+        raise ValueError(f"skor tidak valid untuk id {r.get('id')}: {skor!r}")
+    if math.isnan(skor):
+        raise ValueError(f"skor tidak valid untuk id {r.get('id')}: NaN")
+    skor = min(max(skor, 0.0), 100.0)
+
+    for field in ("analisis_singkat", "rekomendasi"):
+        value = r.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError(f"{field} kosong untuk id {r.get('id')}")
+
+    return {**r, "skor": int(skor) if skor.is_integer() else skor}
+
+
+async def _score_chunk(
+    job_text: str,
+    chunk: List[Dict],
+    semaphore: asyncio.Semaphore,
+) -> List[Dict]:
+    """
+    Nilai satu chunk kandidat. Respons rusak (JSON tidak valid atau ada
+    verdict tanpa skor/teks yang benar) hanya menggagalkan chunk ini
+    (dicoba ulang LLM_CHUNK_RETRIES kali), bukan seluruh shortlist.
+    """
+    ids = {str(c["id"]): c["id"] for c in chunk}
+    messages = build_messages(job_text, chunk)
+
+    for attempt in range(LLM_CHUNK_RETRIES + 1):
+        async with semaphore:
+            try:
+                response = await llm_client.ainvoke(messages)
+                parsed = json.loads(response.content)
+                # id dari JSON model bisa string; samakan dengan id kandidat
+                # (int) seperti verdict dari cache / hasil yang dipakai ulang
+                return [
+                    {**normalize_verdict(r), "id": ids[str(r.get("id"))]}
+                    for r in parsed.get("results", [])
+                    if str(r.get("id")) in ids
+                ]
+            except Exception as e:
+                print(f"❌ LLM Error (chunk {sorted(ids)}, percobaan {attempt + 1}): {e}")
+
+    return []
+
+
+async def _ask_llm_stream(
+    job_text: str,
+    candidates_data: List[Dict],
+    chunk_size: int = LLM_CHUNK_SIZE,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+) -> AsyncIterator[List[Dict]]:
+    """Yield hasil tiap chunk begitu chunk tersebut selesai dinilai."""
+    # profil dipangkas & dikelompokkan agar tiap panggilan muat token budget;
+    # tokenisasi (tiktoken) dijalankan di thread agar tidak menahan event
+    # loop LLM client yang dipakai bersama semua run
+    chunks, report = await asyncio.to_thread(
+        lambda: pack_candidates(
+            candidates_data,
+            render=render_candidate,
+            overhead_tokens=prompt_overhead_tokens(job_text),
+            max_per_call=chunk_size,
+        )
+    )
+    print(
+        f"🤖 [LLM] Menilai {len(candidates_data)} kandidat "
+        f"({len(chunks)} chunk, minimum {report['min_calls']}, maks {max_concurrency} paralel), "
+        f"token prompt per chunk {report['prompt_tokens']}"
+    )
+    print(f"   token per kandidat {report['candidate_tokens']}, dipangkas {report['trimmed']}")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    for finished in asyncio.as_completed([
+        _score_chunk(job_text, chunk, semaphore) for chunk in chunks
+    ]):
+        yield await finished
+
+
+async def score_candidates_with_llm_stream(
+    job_text: str,
+    candidates_data: List[Dict],
+    chunk_size: int = LLM_CHUNK_SIZE,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+) -> AsyncIterator[List[Dict]]:
+    """
+    HR-grade LLM reasoning.
+    Membandingkan FULL JOB TEXT vs FULL CANDIDATE PROFILE TEXT.
+    Verdict yang sudah pernah dinilai (job, profil & prompt sama)
+    diambil dari cache dan di-yield lebih dulu; sisanya dipecah per
+    chunk, dinilai paralel, dan di-yield per chunk yang selesai.
+    """
+
+    if not candidates_data:
+        return
+
+    keys = {
+        str(c["id"]): verdict_key(job_text, c["profile_text"], SYSTEM_PROMPT, LLM_MODEL)
+        for c in candidates_data
+    }
+    # baca/tulis cache SQLite di thread: disk lambat tidak boleh menahan
+    # event loop LLM client (semua panggilan LLM yang sedang berjalan)
+    cached, stats = await asyncio.to_thread(
+        lambda: (get_verdicts(list(keys.values())), llm_store.stats())
+    )
+
+    hits = []
+    misses = []
+    for c in candidates_data:
+        verdict = cached.get(keys[str(c["id"])])
+        if verdict is None:
+            misses.append(c)
+        else:
+            hits.append({"id": c["id"], "nama": c["nama"], **verdict})
+
+    print(
+        f"🗄️ [LLM] Cache: {len(hits)} hit, {len(misses)} miss "
+        f"(hit rate total {stats['hit_rate']:.0%})"
+    )
+
+    if hits:
+        yield hits
+
+    if misses:
+        async for fresh in _ask_llm_stream(job_text, misses, chunk_size, max_concurrency):
+            # hanya simpan verdict untuk kandidat yang memang ditanyakan
+            await asyncio.to_thread(put_verdicts, {
+                keys[str(r["id"])]: r
+                for r in fresh
+                if str(r.get("id")) in keys and r.get("skor") is not None
+            })
+            yield fresh
+
+
+async def score_candidates_with_llm_async(
+    job_text: str,
+    candidates_data: List[Dict],
+    chunk_size: int = LLM_CHUNK_SIZE,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+) -> List[Dict]:
+    results = []
+    async for batch in score_candidates_with_llm_stream(
+        job_text, candidates_data, chunk_size, max_concurrency
+    ):
+        results.extend(batch)
+    return results
+
+
+def score_candidates_with_llm(
+    job_text: str,
+    candidates_data: List[Dict],
+    chunk_size: int = LLM_CHUNK_SIZE,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+) -> List[Dict]:
+    """
+    Versi sync untuk endpoint FastAPI non-async: coroutine dijalankan
+    di event loop LLM client agar pool koneksi dipakai ulang.
+    """
+    return llm_client.run(
+        score_candidates_with_llm_async(job_text, candidates_data, chunk_size, max_concurrency)
+    )
+
+
+def iter_llm_scores(
+    job_text: str,
+    candidates_data: List[Dict],
+    chunk_size: int = LLM_CHUNK_SIZE,
+    max_concurrency: int = LLM_MAX_CONCURRENCY,
+) -> Iterator[List[Dict]]:
+    """
+    Versi sync dari score_candidates_with_llm_stream (untuk generator
+    streaming / worker): tiap batch verdict di-yield begitu tersedia.
+    """
+    batches: queue.Queue = queue.Queue()
+    done = object()
+
+    async def produce():
+        try:
+            async for batch in score_candidates_with_llm_stream(
+                job_text, candidates_data, chunk_size, max_concurrency
+            ):
+                batches.put(batch)
+        finally:
+            batches.put(done)
+
+    future = llm_client.submit(produce())
+    while True:
+        batch = batches.get()
+        if batch is done:
+            break
+        yield batch
+    future.result()
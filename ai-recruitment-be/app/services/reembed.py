@@ -0,0 +1,174 @@
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy.orm import joinedload
+
+from app.core.config import REEMBED_DEBOUNCE_SECONDS
+from app.core.database import SessionLocal
+from app.models.job_posting import JobPosting
+from app.models.user import User
+from app.services.job_embedding import is_stale, refresh_job_embedding
+from app.services.job_pool import job_pool
+from app.services.matching import (
+    build_candidate_dict,
+    build_job_description_text,
+    job_to_profile_dict,
+)
+from app.services.talent_pool import candidate_pool, candidate_query, embed_users
+
+
+class ReembedQueue:
+    """
+    Antrian re-embed kandidat di background dengan debounce.
+    Beberapa penyimpanan beruntun untuk kandidat yang sama
+    (mis. 5 section profil) digabung menjadi satu re-embed.
+    """
+
+    thread_name = "reembed-worker"
+
+    def __init__(self, delay: float = REEMBED_DEBOUNCE_SECONDS):
+        self.delay = delay
+        self._pending: Dict[int, float] = {}  # candidate_id -> waktu jatuh tempo
+        self._cond = threading.Condition()
+        self._thread = None
+
+        self.scheduled = 0
+        self.coalesced = 0
+        self.processed = 0
+        self.failed = 0
+
+    def schedule(self, candidate_id: int) -> None:
+        with self._cond:
+            self.scheduled += 1
+            if candidate_id in self._pending:
+                self.coalesced += 1
+
+            # trailing debounce: timer diulang setiap ada penyimpanan baru
+            self._pending[candidate_id] = time.monotonic() + self.delay
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=self.thread_name,
+                    daemon=True,
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _take_due(self) -> List[int]:
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+
+                now = time.monotonic()
+                due = [cid for cid, at in self._pending.items() if at <= now]
+                if due:
+                    for cid in due:
+                        del self._pending[cid]
+                    return due
+
+                self._cond.wait(timeout=min(self._pending.values()) - now)
+
+    def _run(self) -> None:
+        while True:
+            self.process(self._take_due())
+
+    def flush(self) -> None:
+        """Proses semua antrian sekarang juga (mis. saat shutdown)."""
+        with self._cond:
+            ids = list(self._pending)
+            self._pending.clear()
+        self.process(ids)
+
+    def process(self, candidate_ids: List[int]) -> None:
+        if not candidate_ids:
+            return
+
+        db = SessionLocal()
+        try:
+            # LangChain/Chroma hanya di-import oleh worker, bukan saat startup API
+            from app.services.embedding import update_candidate_embedding
+
+            users = candidate_query(db).filter(User.id.in_(candidate_ids)).all()
+
+            if users:
+                candidate_pool.upsert_many(*embed_users(users))
+            for candidate_id in set(candidate_ids) - {u.id for u in users}:
+                candidate_pool.remove(candidate_id)
+
+            for user in users:
+                update_candidate_embedding(build_candidate_dict(user))
+
+            self.processed += len(candidate_ids)
+            print(f"♻️ Re-embed {len(candidate_ids)} kandidat: {sorted(candidate_ids)}")
+        except Exception as e:
+            self.failed += len(candidate_ids)
+            print(f"❌ Re-embed gagal untuk {sorted(candidate_ids)}: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "pending": pending,
+            "scheduled": self.scheduled,
+            "coalesced": self.coalesced,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+class JobReembedQueue(ReembedQueue):
+    """
+    Antrian embed job (create / update) di background: model embedding
+    tidak dimuat di thread request. Jika belum selesai saat /ai/match,
+    get_job_embedding menghitung vektornya secara lazy.
+    """
+
+    thread_name = "job-reembed-worker"
+
+    def process(self, job_ids: List[int]) -> None:
+        if not job_ids:
+            return
+
+        db = SessionLocal()
+        try:
+            jobs = (
+                db.query(JobPosting)
+                .options(
+                    joinedload(JobPosting.skills),
+                    joinedload(JobPosting.certifications),
+                    joinedload(JobPosting.embedding),
+                )
+                .filter(JobPosting.id.in_(job_ids))
+                .all()
+            )
+
+            for job in jobs:
+                job_text = build_job_description_text(job_to_profile_dict(job))
+                if is_stale(job, job_text):
+                    vector = refresh_job_embedding(db, job, job_text)
+                else:
+                    vector = np.frombuffer(job.embedding.vector, dtype=np.float32)
+                job_pool.sync(job, vector)
+
+            for job_id in set(job_ids) - {job.id for job in jobs}:
+                job_pool.remove(job_id)
+
+            self.processed += len(job_ids)
+            print(f"♻️ Embed {len(job_ids)} job: {sorted(job_ids)}")
+        except Exception as e:
+            db.rollback()
+            self.failed += len(job_ids)
+            print(f"❌ Embed job gagal untuk {sorted(job_ids)}: {e}")
+        finally:
+            db.close()
+
+
+reembed_queue = ReembedQueue()
+job_reembed_queue = JobReembedQueue()
@@ -0,0 +1,458 @@
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.config import LEXICAL_PREFILTER_KEEP, LEXICAL_PREFILTER_MIN_POOL, LLM_MODEL
+from app.models.ai_screening_result import AIScreeningResult
+from app.models.application import Application
+from app.models.application_semantic_score import ApplicationSemanticScore
+from app.models.user import User
+from app.services.job_embedding import get_job_embedding
+from app.services.llm_cache import job_fingerprint, profile_fingerprint
+from app.services.lexical_index import lexical_index, load_lexical_index
+from app.services.matching import (
+    build_candidate_dict,
+    build_candidate_sections,
+    build_candidate_text,
+    match_candidates,
+)
+from app.services.prefilter import prefilter_applicants
+from app.services.query import SYSTEM_PROMPT
+
+
+def map_llm_recommendation(rec: str) -> str:
+    rec = rec.lower().strip()
+    if rec == "lolos":
+        return "PASS"
+    elif rec in ["pertimbangkan", "review"]:
+        return "REVIEW"
+    return "REJECT"
+
+
+def shortlist_limit(job_profile: dict) -> int:
+    """Jumlah kandidat yang lanjut ke LLM: required_candidates * 2."""
+    required = job_profile["additional_info"].get("required_candidates", 1)
+
+    # fallback safety
+    if not required or required < 1:
+        required = 1
+
+    return required * 2
+
+
+def select_applicants(
+    db: Session,
+    job_profile: dict,
+    max_salary: Optional[int] = None,
+    location: Optional[str] = None,
+) -> Tuple[List[int], Dict[str, int], Optional[List[int]]]:
+    """
+    User id pelamar yang lolos syarat wajib (dan prefilter lexical untuk
+    jumlah pelamar besar). Return (ids, jumlah dibuang per aturan,
+    considered): considered = pelamar yang lolos prefilter (syarat wajib
+    + filter request) sebelum potongan lexical.
+    """
+    job_skills = job_profile["requirements"]["skills"]
+
+    # syarat wajib (gaji, lokasi, pengalaman, pendidikan) disaring
+    # sebelum profil lengkap dimuat dan di-embed
+    applicant_ids, removed = prefilter_applicants(
+        db,
+        job_profile,
+        max_salary=max_salary,
+        location=location,
+    )
+    print(f"🧹 Prefilter syarat wajib: {len(applicant_ids)} lolos, dibuang per aturan {removed}")
+    considered = applicant_ids
+
+    # pelamar sangat banyak: saring dulu dengan BM25 skill (murah)
+    # sebelum memuat profil lengkap dan meng-embed
+    if len(applicant_ids) > LEXICAL_PREFILTER_MIN_POOL and job_skills:
+        load_lexical_index()
+        kept = lexical_index.prefilter(
+            job_skills,
+            applicant_ids,
+            keep=max(LEXICAL_PREFILTER_KEEP, shortlist_limit(job_profile) * 10),
+        )
+        print(f"🔤 Prefilter lexical: {len(applicant_ids)} → {len(kept)} pelamar")
+        applicant_ids = kept
+
+    return applicant_ids, removed, considered
+
+
+def build_shortlist(
+    db: Session,
+    job_id: int,
+    max_salary: Optional[int] = None,
+    location: Optional[str] = None,
+) -> dict:
+    """
+    Tahap non-LLM dari /ai/match: job profile, prefilter, load pelamar,
+    lalu ranking hybrid. Return context yang dipakai tahap LLM & simpan.
+    """
+
+    # =========================
+    # 1️⃣ JOB PROFILE (FULL)
+    # =========================
+    job_profile, job_text, job_vector = get_job_embedding(db, job_id)
+    print("Job Text:", job_text)
+
+    job_skills = job_profile["requirements"]["skills"]
+    limit = shortlist_limit(job_profile)
+
+    # =========================
+    # 2️⃣ APPLICATIONS
+    # =========================
+    applicant_ids, removed, considered = select_applicants(
+        db,
+        job_profile,
+        max_salary=max_salary,
+        location=location,
+    )
+
+    applications = (
+        db.query(Application)
+        .options(
+            joinedload(Application.user).joinedload(User.skills),
+            joinedload(Application.user).joinedload(User.experiences),
+            joinedload(Application.user).joinedload(User.educations),
+            joinedload(Application.user).joinedload(User.salary),
+            joinedload(Application.user).joinedload(User.documents),
+        )
+        .filter(
+            Application.job_id == job_id,
+            Application.user_id.in_(applicant_ids),
+        )
+        .all()
+    ) if applicant_ids else []
+
+    context = {
+        "job_profile": job_profile,
+        "job_text": job_text,
+        # id polos (bukan objek ORM): tetap valid setelah commit di tengah run
+        "application_ids": {app.user_id: app.id for app in applications},
+        "prefilter": {"kept": len(applicant_ids), "removed": removed},
+        "shortlist": [],
+    }
+
+    if not applications:
+        save_semantic_scores(
+            db, job_id, {}, [],
+            considered_user_ids=considered,
+            filtered=max_salary is not None or bool(location),
+        )
+        return context
+
+    # =========================
+    # 3️⃣ BUILD CANDIDATE TEXT
+    # =========================
+    candidates_for_matching = []
+
+    for app in applications:
+        user = app.user
+
+        # profil tanpa posisi yang dilamar: teks (dan embedding cache-nya)
+        # sama untuk semua job dan sama dengan talent pool / re-embed
+        candidate_dict = build_candidate_dict(user)
+
+        candidate_text = build_candidate_text(candidate_dict)
+
+        candidates_for_matching.append({
+            "id": user.id,
+            "name": user.full_name,
+            "text": candidate_text,
+            "sections": build_candidate_sections(candidate_dict),
+        })
+
+    # =========================
+    # 4️⃣ HYBRID MATCHING (SEMANTIC + BM25 SKILL)
+    # =========================
+    # semua pelamar diskor & disimpan (ranking di /candidates/management),
+    # hanya top `limit` yang lanjut ke LLM
+    ranked = match_candidates(
+        job_text=job_text,
+        candidates=candidates_for_matching,
+        job_embedding=job_vector,
+        job_skills=job_skills,
+    )
+    save_semantic_scores(
+        db, job_id, context["application_ids"], ranked,
+        considered_user_ids=considered,
+        filtered=max_salary is not None or bool(location),
+    )
+
+    top_candidates = ranked[:limit]
+    print("Top Candidates:")
+    for c in top_candidates:
+        print(f"Candidate ID: {c['id']}, Name: {c['name']}")
+        print("Text Preview:")
+        print(c["text"][:300] + "...\n")
+
+    context["shortlist"] = top_candidates
+    return context
+
+
+def llm_candidates(shortlist: List[Dict]) -> List[Dict]:
+    """Input tahap LLM dari hasil ranking."""
+    return [
+        {
+            "id": c["id"],
+            "nama": c["name"],
+            "profile_text": c["text"],
+        }
+        for c in shortlist
+    ]
+
+
+def split_reusable(
+    db: Session,
+    context: dict,
+    force: bool = False,
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Pisahkan shortlist: kandidat yang hasil screening tersimpannya masih
+    sesuai fingerprint job & profil (dipakai ulang) vs yang perlu di-score
+    LLM. force=True: semua di-score ulang.
+    Return (hasil lama format LLM, kandidat shortlist untuk LLM).
+    """
+    shortlist = context["shortlist"]
+    application_ids = context["application_ids"]
+
+    job_fp = job_fingerprint(context["job_text"], SYSTEM_PROMPT, LLM_MODEL)
+    context["fingerprints"] = {
+        c["id"]: (job_fp, profile_fingerprint(c["text"]))
+        for c in shortlist
+    }
+
+    existing = {}
+    if not force and shortlist:
+        rows = (
+            db.query(AIScreeningResult)
+            .filter(AIScreeningResult.application_id.in_(
+                [application_ids[c["id"]] for c in shortlist]
+            ))
+            .all()
+        )
+        existing = {row.application_id: row for row in rows}
+
+    reused, to_score = [], []
+    for c in shortlist:
+        row = existing.get(application_ids[c["id"]])
+        if row is not None and (row.job_fingerprint, row.profile_fingerprint) == context["fingerprints"][c["id"]]:
+            reused.append({
+                "id": c["id"],
+                "nama": c["name"],
+                "skor": int(row.fit_score) if row.fit_score.is_integer() else row.fit_score,
+                "analisis_singkat": row.summary,
+                "rekomendasi": row.reason,
+            })
+        else:
+            to_score.append(c)
+
+    context["reuse"] = {"reused": len(reused), "recomputed": len(to_score)}
+    print(f"♻️ Screening: {len(reused)} dipakai ulang, {len(to_score)} di-score ulang")
+    return reused, to_score
+
+
+# kolom AIScreeningResult yang diperbarui jika application_id sudah punya hasil
+_UPSERT_COLUMNS = (
+    "fit_score",
+    "summary",
+    "recommendation_status",
+    "confidence",
+    "reason",
+    "job_fingerprint",
+    "profile_fingerprint",
+    "created_at",
+)
+
+
+def bulk_upsert(db: Session, model, rows: List[Dict], columns) -> None:
+    """
+    Tulis semua baris dalam satu statement multi-row (INSERT ... ON
+    DUPLICATE KEY UPDATE di MySQL, ON CONFLICT di SQLite / PostgreSQL)
+    berdasarkan unique key application_id; `columns` diperbarui jika
+    baris sudah ada.
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in columns}
+        )
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.application_id],
+            set_={column: stmt.excluded[column] for column in columns},
+        )
+
+    db.execute(stmt)
+
+
+def save_semantic_scores(
+    db: Session,
+    job_id: int,
+    application_ids: Dict[int, int],
+    ranked: List[Dict],
+    considered_user_ids: Optional[List[int]] = None,
+    filtered: bool = False,
+) -> None:
+    """
+    Simpan skor match_candidates pelamar job (satu bulk upsert), lalu
+    hapus skor lama yang tidak ditulis ulang di run ini:
+    - pelamar dalam considered_user_ids (lolos prefilter) yang terpotong
+      shortlist lexical;
+    - tanpa filter request (filtered=False): semua pelamar lain juga
+      (gagal syarat wajib job).
+    Dengan filter gaji/lokasi, pelamar yang tersaring filter tersebut
+    tidak ikut dinilai sehingga skornya dibiarkan.
+    None = tanpa pruning.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "application_id": application_ids[c["id"]],
+            "job_id": job_id,
+            "semantic_score": c["semantic_score"],
+            "lexical_score": c["lexical_score"],
+            "match_score": c["match_score"],
+            "updated_at": now,
+        }
+        for c in ranked
+        if c["id"] in application_ids
+    ]
+    bulk_upsert(
+        db,
+        ApplicationSemanticScore,
+        rows,
+        ("job_id", "semantic_score", "lexical_score", "match_score", "updated_at"),
+    )
+
+    if considered_user_ids is not None:
+        considered = set(considered_user_ids)
+        written = {row["application_id"] for row in rows}
+        stale = [
+            application_id
+            for application_id, user_id in (
+                db.query(ApplicationSemanticScore.application_id, Application.user_id)
+                .join(Application, Application.id == ApplicationSemanticScore.application_id)
+                .filter(ApplicationSemanticScore.job_id == job_id)
+                .all()
+            )
+            if application_id not in written and (not filtered or user_id in considered)
+        ]
+        if stale:
+            db.query(ApplicationSemanticScore).filter(
+                ApplicationSemanticScore.application_id.in_(stale)
+            ).delete(synchronize_session=False)
+
+    db.commit()
+    print(f"📊 Skor semantik disimpan: {len(rows)} pelamar")
+
+
+def save_screening_results(
+    db: Session,
+    application_ids: Dict[int, int],
+    results: List[Dict],
+    fingerprints: Optional[Dict[int, Tuple[str, str]]] = None,
+) -> int:
+    """
+    Simpan verdict LLM ke AIScreeningResult (satu bulk upsert), lalu commit.
+    application_ids: user_id -> application_id.
+    fingerprints: user_id -> (job, profil), lihat split_reusable.
+    Return jumlah hasil yang disimpan.
+    """
+    fingerprints = fingerprints or {}
+    now = datetime.utcnow()
+    rows = {}
+    for r in results:
+        user_id = int(r["id"])
+        application_id = application_ids.get(user_id)
+        if application_id is None:
+            continue
+
+        job_fp, profile_fp = fingerprints.get(user_id, (None, None))
+        rows[application_id] = {
+            "application_id": application_id,
+            "fit_score": r["skor"],
+            "summary": r["analisis_singkat"],
+            "recommendation_status": map_llm_recommendation(r["rekomendasi"]),
+            "confidence": r["skor"] / 100,
+            "reason": r["rekomendasi"],
+            "job_fingerprint": job_fp,
+            "profile_fingerprint": profile_fp,
+            "created_at": now,
+        }
+
+    bulk_upsert(db, AIScreeningResult, list(rows.values()), _UPSERT_COLUMNS)
+    db.commit()
+    return len(rows)
+
+
+def to_ui_result(r: Dict) -> dict:
+    return {
+        "candidate": {
+            "id": r["id"],
+            "user": {
+                "name": r["nama"],
+                "email": "",
+                "avatarUrl": ""
+            }
+        },
+        "fitScore": r["skor"],
+        "summary": r["analisis_singkat"],
+        "screeningRecommendation": {
+            "status": map_llm_recommendation(r["rekomendasi"]),
+            "confidence": r["skor"] / 100,
+            "reason": r["rekomendasi"]
+        }
+    }
+
+
+class MatchMetrics:
+    """
+    Latensi /ai/match per mode: time-to-first-result (TTFR),
+    waktu sampai verdict LLM pertama, dan total durasi.
+    """
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+        self.window = window
+
+    def record(self, metric: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(metric, deque(maxlen=self.window)).append(seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = {}
+            for metric, samples in self._samples.items():
+                values = np.array(samples)
+                out[metric] = {
+                    "count": len(values),
+                    "p50_s": round(float(np.percentile(values, 50)), 3),
+                    "p95_s": round(float(np.percentile(values, 95)), 3),
+                    "max_s": round(float(values.max()), 3),
+                }
+            return out
+
+
+match_metrics = MatchMetrics()
@@ -0,0 +1,169 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from app.core.config import SCREENING_RUN_STALE_SECONDS, SCREENING_WORKERS
+from app.core.database import SessionLocal
+from app.models.screening_run import ScreeningRun
+from app.services.query import iter_llm_scores
+from app.services.screening import (
+    build_shortlist,
+    llm_candidates,
+    match_metrics,
+    save_screening_results,
+    split_reusable,
+    to_ui_result,
+)
+
+
+class ScreeningRunner:
+    """
+    Worker pool untuk screening run: pipeline /ai/match (embed + LLM +
+    simpan) dijalankan di thread sendiri, bukan di threadpool request
+    API. Progres ditulis ke tabel screening_runs untuk di-poll.
+    """
+
+    def __init__(self, workers: int = SCREENING_WORKERS):
+        self.workers = workers
+        self._executor = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="screening-run",
+            )
+        return self._executor
+
+    def submit(self, run_id: int) -> None:
+        self._pool().submit(self._execute, run_id)
+
+    @staticmethod
+    def _claim(db, run_id: int) -> bool:
+        """
+        Ambil run secara atomik (queued -> running). Hanya satu worker /
+        proses uvicorn yang berhasil, sisanya melewati run ini.
+        """
+        now = datetime.utcnow()
+        claimed = (
+            db.query(ScreeningRun)
+            .filter(ScreeningRun.id == run_id, ScreeningRun.status == "queued")
+            .update(
+                {"status": "running", "stage": "matching", "started_at": now, "heartbeat_at": now},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return claimed == 1
+
+    def _execute(self, run_id: int) -> None:
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if not self._claim(db, run_id):
+                return
+            run = db.get(ScreeningRun, run_id)
+
+            context = build_shortlist(
+                db,
+                run.job_id,
+                max_salary=run.max_salary,
+                location=run.location,
+            )
+
+            reused, to_score = split_reusable(db, context, force=bool(run.force))
+
+            run.stage = "llm"
+            run.total_candidates = len(context["shortlist"])
+            run.reused_candidates = len(reused)
+            run.scored_candidates = len(reused)
+            run.heartbeat_at = datetime.utcnow()
+            db.commit()
+
+            results = []
+            if to_score:
+                for batch in iter_llm_scores(context["job_text"], llm_candidates(to_score)):
+                    results.extend(batch)
+                    run.scored_candidates = len(reused) + len(results)
+                    run.heartbeat_at = datetime.utcnow()
+                    db.commit()
+
+            run.stage = "saving"
+            run.heartbeat_at = datetime.utcnow()
+            save_screening_results(
+                db,
+                context["application_ids"],
+                results,
+                fingerprints=context["fingerprints"],
+            )
+            results = sorted(reused + results, key=lambda x: x["skor"], reverse=True)
+
+            run.status = "completed"
+            run.stage = None
+            run.results = json.dumps([to_ui_result(r) for r in results], ensure_ascii=False)
+            run.finished_at = datetime.utcnow()
+            db.commit()
+
+            match_metrics.record("run_total", time.perf_counter() - start)
+            print(
+                f"✅ Screening run {run_id}: {len(results)} kandidat "
+                f"({len(reused)} dipakai ulang) dalam {time.perf_counter() - start:.1f}s"
+            )
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Screening run {run_id} gagal: {e}")
+            run = db.get(ScreeningRun, run_id)
+            if run is not None:
+                run.status = "failed"
+                run.error = str(e)
+                run.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+
+    def recover_pending(self) -> None:
+        """
+        Jadwalkan ulang run yang belum selesai saat proses sebelumnya berhenti.
+        Run "running" hanya diambil alih jika heartbeat-nya basi (worker lain
+        mungkin masih mengerjakannya); semua worker boleh memanggil ini,
+        _claim memastikan tiap run hanya dieksekusi sekali.
+        """
+        db = SessionLocal()
+        try:
+            cutoff = datetime.utcnow() - timedelta(seconds=SCREENING_RUN_STALE_SECONDS)
+            stale = (
+                db.query(ScreeningRun)
+                .filter(
+                    ScreeningRun.status == "running",
+                    func.coalesce(ScreeningRun.heartbeat_at, ScreeningRun.started_at) < cutoff,
+                )
+                .update({"status": "queued", "stage": None}, synchronize_session=False)
+            )
+            db.commit()
+            if stale:
+                print(f"🔁 {stale} screening run basi dikembalikan ke antrian")
+
+            pending = (
+                db.query(ScreeningRun.id)
+                .filter(ScreeningRun.status == "queued")
+                .order_by(ScreeningRun.id)
+                .all()
+            )
+            for (run_id,) in pending:
+                self.submit(run_id)
+            if pending:
+                print(f"🔁 {len(pending)} screening run dijadwalkan ulang")
+        finally:
+            db.close()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            # run yang sedang berjalan akan dijadwalkan ulang saat startup berikutnya
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+screening_runner = ScreeningRunner()
@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import (
+    ANN_MIN_POOL_SIZE,
+    TALENT_POOL_LOAD_CHUNK,
+    VECTOR_INDEX_KIND,
+    VECTOR_INDEX_PATH,
+)
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.matching import (
+    build_candidate_dict,
+    build_candidate_sections,
+    build_candidate_text,
+)
+from app.services.profile_embedding import embed_profiles
+from app.services.model_registry import get_model, model_key
+from app.services.vector_index import (
+    ExactIndex,
+    HNSWIndex,
+    VectorIndex,
+    build_hnsw_from,
+    hnsw_available,
+    load_index,
+)
+
+
+class CandidatePool:
+    """
+    Index embedding seluruh kandidat di memori + nama untuk response.
+    Pool kecil memakai ExactIndex (brute-force); pool besar memakai
+    ANN (HNSW) sesuai VECTOR_INDEX_KIND / ANN_MIN_POOL_SIZE.
+    """
+
+    def __init__(self, kind: str = VECTOR_INDEX_KIND):
+        self._lock = threading.RLock()
+        self.kind = kind
+        self.index: Optional[VectorIndex] = None
+        self._names: Dict[int, str] = {}
+        self._hashes: Dict[int, str] = {}  # hash teks profil per vektor di index
+        self._ann_warned = False
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self.index) if self.index is not None else 0
+
+    def _use_ann(self) -> bool:
+        if self.kind == "hnsw":
+            return True
+        if self.kind != "auto" or len(self) < ANN_MIN_POOL_SIZE:
+            return False
+
+        # mode auto: tanpa hnswlib tetap exact (lebih lambat, tapi tidak crash)
+        if not hnsw_available():
+            if not self._ann_warned:
+                print(
+                    f"⚠️ Talent pool {len(self)} kandidat tapi hnswlib belum terinstall "
+                    "— tetap memakai index exact (pip install hnswlib untuk ANN)"
+                )
+                self._ann_warned = True
+            return False
+        return True
+
+    def _maybe_promote(self) -> None:
+        # exact -> HNSW saat pool melewati ambang ANN
+        if isinstance(self.index, ExactIndex) and self._use_ann():
+            print(f"⚡ Talent pool {len(self)} kandidat: beralih ke index HNSW")
+            self.index = build_hnsw_from(self.index)
+
+    def upsert_many(
+        self,
+        candidate_ids: List[int],
+        vectors: np.ndarray,
+        names: Optional[List[str]] = None,
+        hashes: Optional[List[str]] = None,
+    ) -> None:
+        if not candidate_ids:
+            return
+
+        with self._lock:
+            if self.index is None:
+                self.index = ExactIndex(dim=vectors.shape[1])
+
+            self.index.add(candidate_ids, vectors)
+            if names is not None:
+                self._names.update(zip(candidate_ids, names))
+            if hashes is not None:
+                self._hashes.update(zip(candidate_ids, hashes))
+            self._maybe_promote()
+
+    def remove(self, candidate_id: int) -> None:
+        self.remove_many([candidate_id])
+
+    def remove_many(self, candidate_ids) -> None:
+        with self._lock:
+            if self.index is not None:
+                self.index.delete(list(candidate_ids))
+            for candidate_id in candidate_ids:
+                self._names.pop(candidate_id, None)
+                self._hashes.pop(candidate_id, None)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, str, float]]:
+        with self._lock:
+            if self.index is None:
+                return []
+
+            return [
+                (candidate_id, self._names.get(candidate_id), score)
+                for candidate_id, score in self.index.search(query, k)
+            ]
+
+    def save(self, path: str = VECTOR_INDEX_PATH) -> None:
+        """
+        Simpan index ANN ke disk (index exact cukup dibangun ulang dari cache),
+        beserta model_key & hash teks profil untuk sinkronisasi saat load.
+        """
+        with self._lock:
+            if isinstance(self.index, HNSWIndex):
+                self.index.save(path)
+                with open(os.path.join(path, POOL_META_FILE), "w") as f:
+                    json.dump({
+                        "model_key": model_key(),
+                        "hashes": {str(cid): h for cid, h in self._hashes.items()},
+                    }, f)
+                print(f"💾 Index talent pool disimpan di {path}")
+
+
+POOL_META_FILE = "pool.json"
+
+candidate_pool = CandidatePool()
+_load_lock = threading.Lock()
+
+
+def candidate_query(db: Session):
+    return (
+        db.query(User)
+        .options(
+            selectinload(User.skills),
+            selectinload(User.experiences),
+            selectinload(User.educations),
+            selectinload(User.salary),
+            selectinload(User.documents),
+        )
+        .filter(User.role == "candidate")
+    )
+
+
+def profile_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def embed_users(users: Iterable[User]) -> Tuple[List[int], np.ndarray, List[str], List[str]]:
+    """
+    Render profil kandidat (tanpa posisi yang dilamar, agar teks
+    tidak bergantung pada job) lalu encode lewat cache embedding.
+    Return (ids, vektor, nama, hash teks profil).
+    """
+    users = list(users)
+    candidates = [build_candidate_dict(u) for u in users]
+    texts = [build_candidate_text(c) for c in candidates]
+    vectors = embed_profiles(
+        get_model(),
+        texts,
+        [build_candidate_sections(c) for c in candidates],
+        model_name=model_key(),
+    )
+    return (
+        [u.id for u in users],
+        vectors,
+        [u.full_name for u in users],
+        [profile_hash(t) for t in texts],
+    )
+
+
+def _load_persisted_index(db: Session, chunk_size: int) -> bool:
+    """
+    Pakai index ANN dari disk jika ada, lalu sinkronkan dengan database:
+    kandidat baru & yang profilnya berubah (hash teks beda) di-embed,
+    kandidat yang sudah tidak ada dihapus. Index dari model/backend lain
+    dibuang (vektor fp32 dan int8 tidak boleh tercampur).
+    """
+    if candidate_pool.kind == "exact":
+        return False
+    if candidate_pool.kind == "auto" and not hnsw_available():
+        return False
+
+    meta_path = os.path.join(VECTOR_INDEX_PATH, POOL_META_FILE)
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get("model_key") != model_key():
+        print(
+            f"♻️ Index talent pool di {VECTOR_INDEX_PATH} dibuat dengan model "
+            f"{meta.get('model_key')}, bukan {model_key()} — dibangun ulang"
+        )
+        return False
+
+    index = load_index(VECTOR_INDEX_PATH)
+    if index is None:
+        return False
+
+    names = dict(
+        db.query(User.id, User.full_name)
+        .filter(User.role == "candidate")
+        .all()
+    )
+    indexed = index.ids()
+    stored = {int(cid): h for cid, h in meta.get("hashes", {}).items()}
+
+    candidate_pool.index = index
+    candidate_pool._names = names
+    candidate_pool._hashes = {cid: h for cid, h in stored.items() if cid in indexed}
+    candidate_pool.remove_many(indexed - names.keys())
+
+    # render semua profil (murah), embed ulang hanya yang baru / berubah
+    refreshed = 0
+    last_id = 0
+    while True:
+        users = (
+            candidate_query(db)
+            .filter(User.id > last_id)
+            .order_by(User.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not users:
+            break
+
+        last_id = users[-1].id
+        changed = [
+            u for u in users
+            if u.id not in indexed
+            or stored.get(u.id) != profile_hash(build_candidate_text(build_candidate_dict(u)))
+        ]
+        if changed:
+            candidate_pool.upsert_many(*embed_users(changed))
+            refreshed += len(changed)
+        db.expunge_all()
+
+    print(f"💾 Index talent pool dimuat dari {VECTOR_INDEX_PATH} ({refreshed} kandidat baru/berubah di-embed)")
+    return True
+
+
+def load_candidate_pool(chunk_size: int = TALENT_POOL_LOAD_CHUNK) -> None:
+    """
+    Isi talent pool dari database, per chunk (keyset pagination by id).
+    Memakai session sendiri agar bisa dipanggil dari warm-up startup.
+    """
+    with _load_lock:
+        if candidate_pool.loaded:
+            return
+
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            if not _load_persisted_index(db, chunk_size):
+                last_id = 0
+                while True:
+                    users = (
+                        candidate_query(db)
+                        .filter(User.id > last_id)
+                        .order_by(User.id)
+                        .limit(chunk_size)
+                        .all()
+                    )
+                    if not users:
+                        break
+
+                    candidate_pool.upsert_many(*embed_users(users))
+                    last_id = users[-1].id
+                    db.expunge_all()
+
+                candidate_pool.save()
+        finally:
+            db.close()
+
+        candidate_pool.loaded = True
+        print(
+            f"👥 Talent pool dimuat: {len(candidate_pool)} kandidat "
+            f"dalam {time.perf_counter() - start:.2f}s"
+        )
+
+
+def refresh_candidate(db: Session, candidate_id: int) -> None:
+    """
+    Update satu kandidat di talent pool (incremental).
+    """
+    user = candidate_query(db).filter(User.id == candidate_id).first()
+    if not user:
+        candidate_pool.remove(candidate_id)
+        return
+
+    candidate_pool.upsert_many(*embed_users([user]))
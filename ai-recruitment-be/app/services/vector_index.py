@@ -0,0 +1,343 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    HNSW_M,
+)
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Index skor tertinggi (descending) dengan partial selection.
+    Hanya k teratas yang di-sort, sisanya cukup dipartisi O(n).
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class VectorIndex:
+    """
+    Interface index vektor kandidat. Vektor diasumsikan ternormalisasi,
+    sehingga skor = inner product = cosine similarity.
+    """
+
+    kind = "base"
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Tambah atau timpa (upsert) vektor berdasarkan candidate_id."""
+        raise NotImplementedError
+
+    def delete(self, ids: Sequence[int]) -> None:
+        raise NotImplementedError
+
+    def ids(self) -> set:
+        raise NotImplementedError
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+    def save(self, path: str) -> None:
+        raise NotImplementedError
+
+
+class ExactIndex(VectorIndex):
+    """
+    Brute-force exact search di atas matriks float32 (array-backed).
+    Baris ke-i milik self._ids[i]; hapus memakai swap-remove.
+    """
+
+    kind = "exact"
+
+    def __init__(self, dim: int, initial_capacity: int = 1024):
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._capacity = initial_capacity
+        self._matrix = np.empty((initial_capacity, dim), dtype=np.float32)
+        self._ids = np.empty(initial_capacity, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ensure_capacity(self, needed: int) -> None:
+        if needed <= self._capacity:
+            return
+
+        # tumbuh geometris agar append tetap amortized O(1)
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+
+        self._matrix, self._ids, self._capacity = matrix, ids, capacity
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        with self._lock:
+            self._ensure_capacity(self._size + len(ids))
+
+            for i, candidate_id in enumerate(ids):
+                candidate_id = int(candidate_id)
+                row = self._rows.get(candidate_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[candidate_id] = row
+                    self._ids[row] = candidate_id
+
+                self._matrix[row] = vectors[i]
+
+    def delete(self, ids: Sequence[int]) -> None:
+        with self._lock:
+            for candidate_id in ids:
+                row = self._rows.pop(int(candidate_id), None)
+                if row is None:
+                    continue
+
+                last = self._size - 1
+                if row != last:
+                    moved_id = int(self._ids[last])
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = moved_id
+                    self._rows[moved_id] = row
+
+                self._size -= 1
+
+    def ids(self) -> set:
+        with self._lock:
+            return set(self._rows)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            if self._size == 0:
+                return []
+
+            scores = self._matrix[:self._size] @ query.astype(np.float32, copy=False)
+            return [
+                (int(self._ids[i]), float(scores[i]))
+                for i in top_k_indices(scores, k)
+            ]
+
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Salinan (ids, matrix) untuk membangun index lain."""
+        with self._lock:
+            return self._ids[:self._size].copy(), self._matrix[:self._size].copy()
+
+    def save(self, path: str) -> None:
+        ids, matrix = self.items()
+        os.makedirs(path, exist_ok=True)
+        np.savez(os.path.join(path, "exact.npz"), ids=ids, matrix=matrix)
+        _write_meta(path, {"kind": self.kind, "dim": self.dim})
+
+    @classmethod
+    def load(cls, path: str) -> "ExactIndex":
+        data = np.load(os.path.join(path, "exact.npz"))
+        index = cls(dim=data["matrix"].shape[1], initial_capacity=max(len(data["ids"]), 1))
+        index.add(data["ids"].tolist(), data["matrix"])
+        return index
+
+
+class HNSWIndex(VectorIndex):
+    """
+    Approximate nearest neighbour (HNSW, CPU) via hnswlib.
+    Hapus memakai mark_deleted; candidate_id dipakai langsung sebagai label.
+    """
+
+    kind = "hnsw"
+
+    def __init__(
+        self,
+        dim: int,
+        max_elements: int = 10000,
+        m: int = HNSW_M,
+        ef_construction: int = HNSW_EF_CONSTRUCTION,
+        ef_search: int = HNSW_EF_SEARCH,
+    ):
+        try:
+            import hnswlib
+        except ImportError as e:
+            raise RuntimeError(
+                "hnswlib belum terinstall (pip install hnswlib) "
+                "— gunakan VECTOR_INDEX_KIND=exact"
+            ) from e
+
+        self.dim = dim
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+
+        self._lock = threading.RLock()
+        self._index = hnswlib.Index(space="ip", dim=dim)
+        self._index.init_index(
+            max_elements=max_elements,
+            M=m,
+            ef_construction=ef_construction,
+        )
+        self._index.set_ef(ef_search)
+        self._labels = set()
+        self._deleted = set()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        if len(ids) == 0:
+            return
+
+        ids = [int(i) for i in ids]
+        with self._lock:
+            new_total = len(self._labels) + len(self._deleted) + len(ids)
+            capacity = self._index.get_max_elements()
+            if new_total > capacity:
+                self._index.resize_index(max(new_total, capacity * 2))
+
+            for candidate_id in ids:
+                if candidate_id in self._deleted:
+                    self._index.unmark_deleted(candidate_id)
+                    self._deleted.discard(candidate_id)
+
+            # label yang sudah ada akan di-update vektornya
+            self._index.add_items(
+                np.asarray(vectors, dtype=np.float32),
+                np.asarray(ids, dtype=np.int64),
+            )
+            self._labels.update(ids)
+
+    def delete(self, ids: Sequence[int]) -> None:
+        with self._lock:
+            for candidate_id in ids:
+                candidate_id = int(candidate_id)
+                if candidate_id in self._labels:
+                    self._index.mark_deleted(candidate_id)
+                    self._labels.discard(candidate_id)
+                    self._deleted.add(candidate_id)
+
+    def ids(self) -> set:
+        with self._lock:
+            return set(self._labels)
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        with self._lock:
+            k = min(k, len(self._labels))
+            if k <= 0:
+                return []
+
+            self._index.set_ef(max(self.ef_search, k))
+            labels, distances = self._index.knn_query(
+                np.asarray(query, dtype=np.float32).reshape(1, -1),
+                k=k,
+            )
+            # hnswlib "ip" distance = 1 - inner product
+            return [
+                (int(label), float(1.0 - dist))
+                for label, dist in zip(labels[0], distances[0])
+            ]
+
+    def save(self, path: str) -> None:
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            self._index.save_index(os.path.join(path, "hnsw.bin"))
+            _write_meta(path, {
+                "kind": self.kind,
+                "dim": self.dim,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+                "labels": sorted(self._labels),
+                "deleted": sorted(self._deleted),
+            })
+
+    @classmethod
+    def load(cls, path: str) -> "HNSWIndex":
+        meta = _read_meta(path)
+        index = cls(
+            dim=meta["dim"],
+            max_elements=1,
+            m=meta["m"],
+            ef_construction=meta["ef_construction"],
+            ef_search=meta["ef_search"],
+        )
+        total = len(meta["labels"]) + len(meta["deleted"])
+        index._index = type(index._index)(space="ip", dim=meta["dim"])
+        index._index.load_index(os.path.join(path, "hnsw.bin"), max_elements=max(total, 1))
+        index._index.set_ef(index.ef_search)
+        index._labels = set(meta["labels"])
+        index._deleted = set(meta["deleted"])
+        return index
+
+
+def _write_meta(path: str, meta: dict) -> None:
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def _read_meta(path: str) -> dict:
+    with open(os.path.join(path, "meta.json")) as f:
+        return json.load(f)
+
+
+def load_index(path: str) -> Optional[VectorIndex]:
+    """
+    Load index yang tersimpan di disk, atau None jika belum ada.
+    """
+    if not os.path.exists(os.path.join(path, "meta.json")):
+        return None
+
+    kind = _read_meta(path)["kind"]
+    if kind == HNSWIndex.kind:
+        return HNSWIndex.load(path)
+    return ExactIndex.load(path)
+
+
+def hnsw_available() -> bool:
+    try:
+        import hnswlib  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_hnsw_from(exact: ExactIndex) -> HNSWIndex:
+    ids, matrix = exact.items()
+    index = HNSWIndex(dim=exact.dim, max_elements=max(len(ids), 1))
+    index.add(ids.tolist(), matrix)
+    return index
+
+
+def evaluate_recall(
+    index: VectorIndex,
+    exact: ExactIndex,
+    queries: np.ndarray,
+    k: int = 10,
+) -> float:
+    """
+    recall@k rata-rata: porsi hasil exact top-k yang juga ditemukan index.
+    """
+    if len(queries) == 0:
+        return 0.0
+
+    total = 0.0
+    for query in queries:
+        truth = {i for i, _ in exact.search(query, k)}
+        found = {i for i, _ in index.search(query, k)}
+        total += len(truth & found) / max(len(truth), 1)
+    return total / len(queries)
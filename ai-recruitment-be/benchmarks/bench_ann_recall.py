@@ -0,0 +1,78 @@
+"""
+Evaluasi index ANN (HNSW) vs exact search: recall@k, waktu build dan latensi query.
+Vektor sintetis ber-cluster (mirip distribusi embedding profil kandidat).
+
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_ann_recall --n 100000 --k 10
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.vector_index import (
+    ExactIndex,
+    HNSWIndex,
+    build_hnsw_from,
+    evaluate_recall,
+    load_index,
+)
+
+
+def make_vectors(n: int, dim: int, clusters: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + 0.5 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def query_latency_ms(index, queries, k) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q, k)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=200)
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.n, args.dim, args.clusters)
+    queries = make_vectors(args.queries, args.dim, args.clusters, seed=1)
+
+    exact = ExactIndex(dim=args.dim, initial_capacity=args.n)
+    exact.add(list(range(args.n)), vectors)
+
+    start = time.perf_counter()
+    hnsw = build_hnsw_from(exact)
+    build_seconds = time.perf_counter() - start
+
+    # hapus sebagian kandidat di kedua index agar delete ikut teruji
+    removed = list(range(0, args.n, 100))
+    exact.delete(removed)
+    hnsw.delete(removed)
+
+    with tempfile.TemporaryDirectory() as path:
+        hnsw.save(path)
+        reloaded = load_index(path)
+        assert isinstance(reloaded, HNSWIndex) and len(reloaded) == len(hnsw)
+
+    recall = evaluate_recall(reloaded, exact, queries, args.k)
+
+    print(f"pool: {len(exact)} kandidat, dim={args.dim}, k={args.k}")
+    print(f"  build HNSW     : {build_seconds:.2f}s")
+    print(f"  exact  query   : {query_latency_ms(exact, queries, args.k):.2f} ms")
+    print(f"  HNSW   query   : {query_latency_ms(reloaded, queries, args.k):.2f} ms")
+    print(f"  recall@{args.k:<7}: {recall:.4f}")
+
+
+if __name__ == "__main__":
+    main()
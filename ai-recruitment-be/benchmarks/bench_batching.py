@@ -0,0 +1,107 @@
+"""
+Benchmark dynamic batching pada profil sintetis long-tail:
+batch tetap sesuai urutan datang vs bucket panjang token dengan token budget.
+
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_batching --n 2000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.core.config import EMBEDDING_BATCH_SIZE, EMBEDDING_TOKEN_BUDGET
+from app.services.batching import encode_batched, padding_efficiency, plan_batches, token_lengths
+from app.services.matching import build_candidate_text
+from app.services.model_registry import get_model
+
+WORDS = (
+    "mengembangkan layanan backend microservices golang python java kubernetes "
+    "docker postgresql redis kafka memimpin tim merancang arsitektur api rest "
+    "grpc optimasi performa monitoring observability ci cd cloud aws gcp"
+).split()
+
+
+def make_profiles(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    profiles = []
+    for i in range(n):
+        # sebagian besar profil pendek, sedikit profil senior sangat panjang
+        n_exp = min(int(rng.lognormal(mean=0.7, sigma=0.9)), 25)
+        experiences = [
+            {
+                "jobTitle": f"Engineer {j}",
+                "companyName": f"Perusahaan {j}",
+                "description": " ".join(rng.choice(WORDS, size=int(rng.integers(10, 60)))),
+            }
+            for j in range(n_exp)
+        ]
+        profiles.append(build_candidate_text({
+            "user": {"name": f"Kandidat {i}", "location": "Jakarta"},
+            "skills": [{"name": w} for w in rng.choice(WORDS, size=5)],
+            "workExperience": experiences,
+            "education": [{"degree": "S1", "fieldOfStudy": "Informatika", "institution": "ITB"}],
+            "salaryExpectation": {"min": 10000000, "max": 15000000},
+        }))
+    return profiles
+
+
+def encode_arrival_order(model, texts, batch_size):
+    out = []
+    for i in range(0, len(texts), batch_size):
+        out.append(model.encode(
+            texts[i:i + batch_size],
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ))
+    return np.concatenate(out)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--token-budget", type=int, default=EMBEDDING_TOKEN_BUDGET)
+    args = parser.parse_args()
+
+    model = get_model()
+    texts = make_profiles(args.n)
+    lengths = token_lengths(model, texts)
+
+    arrival_batches = [
+        np.arange(i, min(i + args.batch_size, len(texts)))
+        for i in range(0, len(texts), args.batch_size)
+    ]
+    bucket_batches = plan_batches(lengths, args.token_budget, args.batch_size)
+
+    print(f"{args.n} profil, token p50={int(np.median(lengths))} p95={int(np.percentile(lengths, 95))} max={lengths.max()}")
+    model.encode(texts[:8], normalize_embeddings=True)  # warm-up
+
+    start = time.perf_counter()
+    baseline = encode_arrival_order(model, texts, args.batch_size)
+    arrival_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bucketed = encode_batched(model, texts, args.token_budget, args.batch_size)
+    bucket_seconds = time.perf_counter() - start
+
+    drift = float((1 - (baseline * bucketed).sum(axis=1)).max())
+
+    print(f"{'strategi':<16} {'batch':>6} {'efisiensi padding':>18} {'detik':>8} {'profil/detik':>13}")
+    print(
+        f"{'urutan datang':<16} {len(arrival_batches):>6} "
+        f"{padding_efficiency(lengths, arrival_batches):>18.2%} "
+        f"{arrival_seconds:>8.2f} {args.n / arrival_seconds:>13.1f}"
+    )
+    print(
+        f"{'bucket token':<16} {len(bucket_batches):>6} "
+        f"{padding_efficiency(lengths, bucket_batches):>18.2%} "
+        f"{bucket_seconds:>8.2f} {args.n / bucket_seconds:>13.1f}"
+    )
+    print(f"speedup: {arrival_seconds / bucket_seconds:.2f}x, selisih cosine maks: {drift:.2e}")
+
+
+if __name__ == "__main__":
+    main()
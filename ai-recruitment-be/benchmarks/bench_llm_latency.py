@@ -0,0 +1,104 @@
+"""
+Latensi end-to-end LLM screening terhadap stub LLM lokal, untuk shortlist
+yang makin besar: satu prompt besar (lama) vs chunk paralel (baru).
+
+Stub server dijalankan otomatis di subprocess. Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_llm_latency --sizes 2,4,8,16,32 --chunk-size 4 --concurrency 4
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PORT = 8765
+
+# arahkan client ke stub & matikan cache verdict agar semua request benar-benar dikirim
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{PORT}/v1"
+os.environ.setdefault("OPENAI_API_KEY", "stub")
+os.environ["LLM_CACHE_ENABLED"] = "false"
+
+from app.data.data import candidates_dummy
+from app.services.matching import build_candidate_text
+from app.services.llm_client import llm_client
+from app.services.query import score_candidates_with_llm
+
+JOB_TEXT = (
+    "Backend Developer (Golang). Membangun microservices dengan Go, "
+    "PostgreSQL, Redis, dan Docker. Pengalaman minimal 3 tahun."
+)
+
+
+def wait_for_server(timeout: float = 15.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/docs", timeout=0.5)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError("stub LLM server tidak merespons")
+
+
+def make_shortlist(n: int):
+    return [
+        {
+            "id": i,
+            "nama": candidates_dummy[i % len(candidates_dummy)]["user"]["name"],
+            "profile_text": build_candidate_text(candidates_dummy[i % len(candidates_dummy)]),
+        }
+        for i in range(n)
+    ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    results = fn()
+    return time.perf_counter() - start, len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="2,4,8,16,32")
+    parser.add_argument("--chunk-size", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_llm_server", "--port", str(PORT)],
+    )
+    try:
+        wait_for_server()
+        # warm-up: import LangChain/OpenAI tidak ikut terukur
+        score_candidates_with_llm(JOB_TEXT, make_shortlist(1))
+
+        print(f"{'shortlist':>9}  {'1 prompt':>9}  {'chunked':>9}  {'speedup':>7}")
+        for n in [int(s) for s in args.sizes.split(",")]:
+            shortlist = make_shortlist(n)
+
+            single, got_single = timed(lambda: score_candidates_with_llm(
+                JOB_TEXT, shortlist, chunk_size=n, max_concurrency=1,
+            ))
+            chunked, got_chunked = timed(lambda: score_candidates_with_llm(
+                JOB_TEXT, shortlist, chunk_size=args.chunk_size, max_concurrency=args.concurrency,
+            ))
+            assert got_single == got_chunked == n, (got_single, got_chunked, n)
+
+            print(f"{n:>9}  {single:>8.2f}s  {chunked:>8.2f}s  {single / chunked:>6.1f}x")
+
+        stats = llm_client.stats()
+        print(
+            f"LLM client: {stats['calls']} call, p50 {stats['latency_p50_s']}s, "
+            f"p95 {stats['latency_p95_s']}s, token {stats['prompt_tokens']}+{stats['completion_tokens']}, "
+            f"peak in-flight {stats['peak_in_flight']}/{stats['pool_max_connections']}"
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
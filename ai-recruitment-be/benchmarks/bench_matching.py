@@ -0,0 +1,90 @@
+"""
+Benchmark semantic matching: loop per kandidat (lama) vs batched matrix (baru).
+
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_matching --n 3000
+"""
+
+import argparse
+import os
+import time
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+# ukur encoding murni, tanpa cache embedding
+os.environ.setdefault("EMBEDDING_CACHE_ENABLED", "false")
+
+from app.data.data import candidates_dummy
+from app.services.matching import build_candidate_text, match_candidates
+from app.services.model_registry import get_model
+
+JOB_TEXT = (
+    "Backend Developer (Golang). Membangun microservices dengan Go, "
+    "PostgreSQL, Redis, dan Docker. Pengalaman minimal 3 tahun."
+)
+
+
+def make_candidates(n: int):
+    candidates = []
+    for i in range(n):
+        base = candidates_dummy[i % len(candidates_dummy)]
+        text = build_candidate_text(base)
+        # variasi kecil agar setiap teks unik
+        candidates.append({
+            "id": i,
+            "name": base["user"]["name"],
+            "text": f"{text}\nID Pelamar: {i}",
+        })
+    return candidates
+
+
+def legacy_match(job_text, candidates):
+    model = get_model()
+    job_embedding = model.encode(job_text, normalize_embeddings=True)
+    results = []
+    for c in candidates:
+        candidate_embedding = model.encode(c["text"], normalize_embeddings=True)
+        similarity = cosine_similarity([job_embedding], [candidate_embedding])[0][0]
+        results.append({
+            "id": c["id"],
+            "name": c.get("name"),
+            "semantic_score": round(similarity * 100, 2),
+            "text": c["text"],
+        })
+    return sorted(results, key=lambda x: x["semantic_score"], reverse=True)
+
+
+def run(label, fn, n):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {n:>6} kandidat  {elapsed:8.2f}s  {n / elapsed:10.1f} kandidat/detik")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=3000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.n)
+
+    # warm-up agar waktu load / JIT tidak ikut terukur
+    get_model().encode(["warm up"], normalize_embeddings=True)
+
+    if not args.skip_legacy:
+        before = run("sebelum", lambda: legacy_match(JOB_TEXT, candidates), args.n)
+    after = run(
+        "sesudah",
+        lambda: match_candidates(JOB_TEXT, candidates, top_k=args.top_k),
+        args.n,
+    )
+
+    if not args.skip_legacy:
+        print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Jumlah statement SQL & waktu simpan hasil screening: SELECT per hasil +
+scan linear Application (lama) vs satu bulk upsert (baru).
+
+Memakai SQLite in-memory (ON CONFLICT); di MySQL statement yang sama
+menjadi INSERT ... ON DUPLICATE KEY UPDATE (dicetak di akhir).
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_persistence --n 10,100,500
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (daftarkan semua tabel & relasi)
+from app.core.database import Base
+from app.models.ai_screening_result import AIScreeningResult
+from app.models.application import Application
+from app.services.screening import map_llm_recommendation, save_screening_results
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def legacy_save(db, applications, results):
+    """Jalur lama /ai/match: next() per hasil + SELECT per application_id."""
+    for r in results:
+        user_id = int(r["id"])
+        application = next((a for a in applications if a.user_id == user_id), None)
+        if not application:
+            continue
+
+        existing = (
+            db.query(AIScreeningResult)
+            .filter(AIScreeningResult.application_id == application.id)
+            .first()
+        )
+        if existing:
+            existing.fit_score = r["skor"]
+            existing.summary = r["analisis_singkat"]
+            existing.recommendation_status = map_llm_recommendation(r["rekomendasi"])
+            existing.confidence = r["skor"] / 100
+            existing.reason = r["rekomendasi"]
+        else:
+            db.add(AIScreeningResult(
+                application_id=application.id,
+                fit_score=r["skor"],
+                summary=r["analisis_singkat"],
+                recommendation_status=map_llm_recommendation(r["rekomendasi"]),
+                confidence=r["skor"] / 100,
+                reason=r["rekomendasi"],
+            ))
+    db.commit()
+
+
+def make_session(n: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    applications = [Application(id=i + 1, user_id=1000 + i, job_id=1) for i in range(n)]
+    # seperti context build_shortlist: id diambil sebelum commit
+    application_ids = {a.user_id: a.id for a in applications}
+    db.add_all(applications)
+    db.commit()
+    return engine, db, applications, application_ids
+
+
+def make_results(n: int, round_no: int):
+    return [
+        {
+            "id": 1000 + i,
+            "skor": (i * 7 + round_no * 13) % 100,
+            "analisis_singkat": f"Analisis kandidat {i} (putaran {round_no})",
+            "rekomendasi": ["lolos", "pertimbangkan", "tidak lolos"][(i + round_no) % 3],
+        }
+        for i in range(n)
+    ]
+
+
+def measure(save, n: int):
+    """Dua putaran: insert baru, lalu update semua baris yang sudah ada."""
+    engine, db, applications, application_ids = make_session(n)
+    counter = StatementCounter(engine)
+    out = []
+    for round_no in (1, 2):
+        results = make_results(n, round_no)
+        counter.count = 0
+        start = time.perf_counter()
+        save(db, applications, application_ids, results)
+        out.append((counter.count, time.perf_counter() - start))
+
+    # hasil akhir harus sama persis dengan putaran terakhir
+    stored = {
+        row.application_id: (row.fit_score, row.recommendation_status)
+        for row in db.query(AIScreeningResult).all()
+    }
+    expected = {
+        application_ids[int(r["id"])]: (r["skor"], map_llm_recommendation(r["rekomendasi"]))
+        for r in make_results(n, 2)
+    }
+    db.close()
+    return out, stored == expected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", default="10,100,500")
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'hasil':>6}  {'putaran':>8}  {'stmt lama':>9}  {'stmt baru':>9}  {'lama':>8}  {'baru':>8}")
+    for n in [int(s) for s in args.n.split(",")]:
+        legacy, legacy_ok = measure(
+            lambda db, apps, ids, results: legacy_save(db, apps, results), n,
+        )
+        bulk, bulk_ok = measure(
+            lambda db, apps, ids, results: save_screening_results(db, ids, results), n,
+        )
+        for label, (old_stmt, old_s), (new_stmt, new_s) in zip(("insert", "update"), legacy, bulk):
+            print(f"{n:>6}  {label:>8}  {old_stmt:>9}  {new_stmt:>9}  {old_s * 1000:>6.1f}ms  {new_s * 1000:>6.1f}ms")
+            # bulk upsert: tepat satu statement per penyimpanan, berapa pun jumlah hasil
+            ok &= new_stmt == 1
+        ok &= legacy_ok and bulk_ok
+
+    stmt = mysql.insert(AIScreeningResult.__table__).values([{"application_id": 1, "fit_score": 80}])
+    stmt = stmt.on_duplicate_key_update({"fit_score": stmt.inserted.fit_score})
+    print("\nMySQL:", " ".join(str(stmt.compile(dialect=mysql.dialect())).split()))
+
+    print("\n✅ OK" if ok else "\n❌ Jumlah statement / isi tabel tidak sesuai")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Parity + throughput backend embedding: fp32 (torch) vs int8 (torch-int8 / onnx-int8).
+
+Parity dihitung pada candidates_dummy (app/data/data.py):
+- cosine drift: 1 - cos(vektor fp32, vektor int8) per kandidat
+- ranking agreement: urutan kandidat untuk beberapa job (top-1, overlap top-3, Spearman)
+Exit code 1 jika drift di atas ambang atau agreement (top-1, top-3,
+Spearman) di bawah ambang.
+
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_quantized --backends torch-int8,onnx-int8
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from app.data.data import candidates_dummy
+from app.services.matching import build_candidate_text
+from app.services.model_registry import get_model, model_stats
+
+JOB_TEXTS = [
+    "Backend Developer (Golang): microservices, Go, PostgreSQL, Redis.",
+    "Frontend Engineer: React, TypeScript, desain UI responsif.",
+    "Data Scientist: Python, machine learning, SQL, analisis statistik.",
+    "DevOps Engineer: Kubernetes, Docker, CI/CD, AWS.",
+    "Mobile Developer: Flutter, Kotlin, aplikasi Android dan iOS.",
+]
+
+
+def encode(backend: str, texts):
+    return get_model(backend=backend).encode(
+        texts,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    ).astype(np.float32)
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    ra = np.argsort(np.argsort(-a))
+    rb = np.argsort(np.argsort(-b))
+    n = len(a)
+    return 1 - 6 * float(((ra - rb) ** 2).sum()) / (n * (n ** 2 - 1))
+
+
+def parity(backend: str, candidate_texts, reference: dict) -> dict:
+    cand = encode(backend, candidate_texts)
+    jobs = encode(backend, JOB_TEXTS)
+
+    drift = 1 - (cand * reference["cand"]).sum(axis=1)
+
+    top1, top3, rho = [], [], []
+    for j in range(len(JOB_TEXTS)):
+        ref_scores = reference["cand"] @ reference["jobs"][j]
+        scores = cand @ jobs[j]
+        top1.append(np.argmax(ref_scores) == np.argmax(scores))
+        top3.append(len(set(np.argsort(-ref_scores)[:3]) & set(np.argsort(-scores)[:3])) / 3)
+        rho.append(spearman(ref_scores, scores))
+
+    return {
+        "drift_mean": float(drift.mean()),
+        "drift_max": float(drift.max()),
+        "top1": float(np.mean(top1)),
+        "top3_overlap": float(np.mean(top3)),
+        "spearman": float(np.mean(rho)),
+    }
+
+
+def throughput(backend: str, texts) -> float:
+    model = get_model(backend=backend)
+    model.encode(texts[:8], normalize_embeddings=True)  # warm-up
+    start = time.perf_counter()
+    model.encode(texts, normalize_embeddings=True)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default="torch-int8,onnx-int8")
+    parser.add_argument("--n", type=int, default=1000, help="jumlah teks untuk throughput")
+    parser.add_argument("--max-drift", type=float, default=0.02)
+    parser.add_argument("--min-spearman", type=float, default=0.9)
+    parser.add_argument("--min-top1", type=float, default=0.8, help="minimal rasio job dengan top-1 sama")
+    parser.add_argument("--min-top3", type=float, default=0.8, help="minimal rata-rata overlap top-3")
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    candidate_texts = [build_candidate_text(c) for c in candidates_dummy]
+    bench_texts = [candidate_texts[i % len(candidate_texts)] + f"\nID: {i}" for i in range(args.n)]
+
+    reference = {
+        "cand": encode("torch", candidate_texts),
+        "jobs": encode("torch", JOB_TEXTS),
+    }
+
+    ok = True
+    print(f"{'backend':<12} {'drift avg':>10} {'drift max':>10} {'top1':>6} {'top3':>6} {'rho':>6} {'teks/detik':>11}")
+    print(f"{'torch':<12} {'-':>10} {'-':>10} {'-':>6} {'-':>6} {'-':>6} {throughput('torch', bench_texts):>11.1f}")
+
+    for backend in backends:
+        p = parity(backend, candidate_texts, reference)
+        rate = throughput(backend, bench_texts)
+        print(
+            f"{backend:<12} {p['drift_mean']:>10.5f} {p['drift_max']:>10.5f} "
+            f"{p['top1']:>6.2f} {p['top3_overlap']:>6.2f} {p['spearman']:>6.3f} {rate:>11.1f}"
+        )
+        failed = [
+            name
+            for name, bad in (
+                ("drift", p["drift_max"] > args.max_drift),
+                ("spearman", p["spearman"] < args.min_spearman),
+                ("top1", p["top1"] < args.min_top1),
+                ("top3", p["top3_overlap"] < args.min_top3),
+            )
+            if bad
+        ]
+        if failed:
+            print(f"   ❌ {backend} di luar ambang: {', '.join(failed)}")
+            ok = False
+
+    print()
+    for key, stats in model_stats()["models"].items():
+        print(f"{key}: load {stats['load_seconds']}s, +{stats['rss_delta_mb']} MB RSS")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark cold-start `main:app`: waktu import di proses Python baru,
+plus cek apakah modul ML berat (torch, sentence_transformers, ...) ikut ter-import.
+
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.bench_startup --runs 5 --max-seconds 3
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "sklearn",
+    "transformers",
+    "langchain_openai",
+    "langchain_chroma",
+]
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    results = [measure_once() for _ in range(args.runs)]
+    timings = [r["seconds"] for r in results]
+    heavy = sorted({m for r in results for m in r["heavy"]})
+
+    print(f"cold start main:app ({args.runs} run)")
+    print(f"  min    : {min(timings):.3f}s")
+    print(f"  median : {statistics.median(timings):.3f}s")
+    print(f"  max    : {max(timings):.3f}s")
+    print(f"  modul ML ter-import: {', '.join(heavy) if heavy else '-'}")
+
+    failed = bool(heavy)
+    if args.max_seconds is not None and statistics.median(timings) > args.max_seconds:
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
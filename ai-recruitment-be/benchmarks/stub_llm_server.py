@@ -0,0 +1,85 @@
+"""
+Stub server OpenAI-compatible (/v1/chat/completions) untuk benchmark LLM screening
+tanpa memanggil OpenAI. Latensi disimulasikan: waktu dasar per request +
+waktu "generate" per kandidat di prompt (seperti output token LLM sungguhan).
+
+Jalankan dari folder ai-recruitment-be:
+    python -m benchmarks.stub_llm_server --port 8765
+lalu arahkan aplikasi ke stub:
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub ...
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+
+from fastapi import FastAPI, Request
+
+BASE_LATENCY = 0.3  # detik per request (network + prefill)
+PER_CANDIDATE_LATENCY = 0.4  # detik per kandidat (~150 token output)
+
+app = FastAPI(title="Stub LLM")
+
+_CANDIDATE_RE = re.compile(r"^- (\{.*\})$", re.MULTILINE)
+
+
+def _verdicts(prompt: str) -> list:
+    results = []
+    for line in _CANDIDATE_RE.findall(prompt):
+        candidate = json.loads(line)
+        # skor deterministik agar hasil benchmark stabil
+        score = 60 + sum(map(ord, str(candidate.get("id")))) % 40
+        results.append({
+            "id": str(candidate.get("id")),
+            "nama": candidate.get("nama"),
+            "skor": score,
+            "analisis_singkat": "Respons stub untuk benchmark.",
+            "rekomendasi": "Lolos" if score >= 90 else "Pertimbangkan" if score >= 75 else "Tidak Lolos",
+        })
+    return results
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = "\n".join(m.get("content") or "" for m in body.get("messages", []))
+    results = _verdicts(prompt)
+
+    await asyncio.sleep(BASE_LATENCY + PER_CANDIDATE_LATENCY * len(results))
+
+    content = json.dumps({"results": results}, ensure_ascii=False)
+    prompt_tokens = len(prompt) // 4
+    completion_tokens = len(content) // 4
+    return {
+        "id": f"chatcmpl-stub-{time.time_ns()}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api import job_postings
 from app.api import auth, candidates,job_postings,deps,applications,ai
+from app.core.config import AI_WARMUP
+from app.services.lexical_index import lexical_index, load_lexical_index
+from app.services.llm_cache import llm_store
+from app.services.llm_client import llm_client
+from app.services.model_registry import is_loaded, model_stats, warm_up
+from app.services.reembed import job_reembed_queue, reembed_queue
+from app.services.screening_runs import screening_runner
+from app.services.talent_pool import candidate_pool, load_candidate_pool
 
 # =========================
 # APP INIT
@@ -38,3 +49,59 @@ app.include_router(ai.router)
 @app.get("/")
 def root():
     return {"status": "running"}
+
+# =========================
+# AI WARM-UP & READINESS
+# =========================
+def warm_up_ai():
+    warm_up()
+    load_candidate_pool()
+    load_lexical_index()
+
+
+@app.on_event("startup")
+def start_ai_warmup():
+    # Model ML tidak di-import saat startup; jika AI_WARMUP aktif,
+    # model + talent pool di-load di background supaya worker
+    # langsung bisa melayani request lain
+    if AI_WARMUP:
+        threading.Thread(target=warm_up_ai, name="ai-warmup", daemon=True).start()
+
+    # screening run yang terputus saat restart dilanjutkan worker
+    try:
+        screening_runner.recover_pending()
+    except Exception as e:
+        print(f"❌ Gagal memulihkan screening run: {e}")
+
+
+@app.on_event("shutdown")
+def save_talent_pool():
+    reembed_queue.flush()
+    job_reembed_queue.flush()
+    candidate_pool.save()
+    screening_runner.shutdown()
+    llm_client.close()
+
+
+@app.get("/ready")
+def ready():
+    loaded = is_loaded()
+    body = {
+        "status": "ready" if loaded or not AI_WARMUP else "warming_up",
+        "model_loaded": loaded,
+        "talent_pool": {
+            "loaded": candidate_pool.loaded,
+            "size": len(candidate_pool),
+            "index": candidate_pool.index.kind if candidate_pool.index else None,
+        },
+        "lexical_index": lexical_index.stats(),
+        "reembed": reembed_queue.stats(),
+        "job_reembed": job_reembed_queue.stats(),
+        "llm_cache": llm_store.stats(),
+        "llm": llm_client.stats(),
+        **model_stats(),
+    }
+    # saat warm-up belum selesai, load balancer belum boleh kirim traffic
+    if AI_WARMUP and not loaded:
+        return JSONResponse(status_code=503, content=body)
+    return body